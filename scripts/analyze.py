@@ -13,24 +13,34 @@ Outputs: data/analysis_results.json (consumed by the dashboard generator)
 """
 
 import os
-import json
+import glob
+import orjson
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
 from datetime import datetime, timedelta
 from sklearn.cluster import DBSCAN
-from math import radians
+
+from categories import categorize_type
 
 # Paths
 DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data')
-INPUT_311 = os.path.join(DATA_DIR, '311_requests.csv')
+INPUT_311 = os.path.join(DATA_DIR, '311_requests')  # one Parquet file per year
+INPUT_311_CSV = os.path.join(DATA_DIR, '311_requests.csv')  # pulls from before the Parquet switch
 INPUT_REDDIT = os.path.join(DATA_DIR, 'reddit_posts.csv')
 OUTPUT_PATH = os.path.join(DATA_DIR, 'analysis_results.json')
 
+# Only these 311 columns are used downstream; Parquet lets us skip the rest
+COLUMNS_311 = [
+    'latitude', 'longitude', 'createddate', 'statusdate', 'srstatus', 'srtype',
+    'neighborhood', 'street', 'resolution_days', 'servicerequestnum',
+]
+
 # DBSCAN clustering parameters
-# eps in degrees (~50 meters at Baltimore's latitude)
+# eps in meters, measured on a local equirectangular projection of lat/lon
 CLUSTER_EPS_METERS = 75
 METERS_PER_DEGREE_LAT = 111000
-EPS_DEGREES = CLUSTER_EPS_METERS / METERS_PER_DEGREE_LAT
 MIN_CLUSTER_SAMPLES = 2  # minimum reports to form a cluster
 
 # Thresholds
@@ -47,15 +57,36 @@ def load_data():
     df_311 = None
     df_reddit = None
     
-    if os.path.exists(INPUT_311):
-        df_311 = pd.read_csv(INPUT_311, parse_dates=['createddate', 'statusdate'])
-        print(f"  311 requests: {len(df_311):,} records")
+    year_files = sorted(glob.glob(os.path.join(INPUT_311, '*.parquet')))
+    if year_files:
+        df_311 = read_311_years(year_files)
+        print(f"  311 requests: {len(df_311):,} records ({len(year_files)} year files)")
+    elif os.path.exists(INPUT_311_CSV):
+        # Same column projection for CSV; text columns are read as plain str
+        # (no per-chunk type guessing) and repeated date strings are parsed once
+        df_311 = pd.read_csv(
+            INPUT_311_CSV,
+            usecols=lambda c: c in COLUMNS_311,
+            parse_dates=['createddate', 'statusdate'],
+            cache_dates=True,
+            low_memory=False,
+            dtype={'srstatus': str, 'srtype': str, 'neighborhood': str,
+                   'street': str, 'servicerequestnum': str},
+        )
+        print(f"  311 requests: {len(df_311):,} records (CSV)")
     else:
         print(f"  Warning: 311 data not found at {INPUT_311}")
         print(f"  Run: python scripts/fetch_311.py")
     
     if os.path.exists(INPUT_REDDIT):
-        df_reddit = pd.read_csv(INPUT_REDDIT, parse_dates=['created_utc'])
+        df_reddit = pd.read_csv(INPUT_REDDIT)
+        # fetch_reddit.py stores epoch seconds (UTC); older CSVs hold date strings
+        if 'created_utc' in df_reddit.columns:
+            created = df_reddit['created_utc']
+            if pd.api.types.is_numeric_dtype(created):
+                df_reddit['created_utc'] = pd.to_datetime(created, unit='s')
+            else:
+                df_reddit['created_utc'] = pd.to_datetime(created)
         print(f"  Reddit posts: {len(df_reddit):,} records")
     else:
         print(f"  Note: Reddit data not found — gap analysis will be skipped")
@@ -63,33 +94,53 @@ def load_data():
     return df_311, df_reddit
 
 
+def read_311_years(year_files):
+    """
+    Read the per-year Parquet files written by fetch_311.py into one frame.
+    Each file is projected to the COLUMNS_311 it actually has, and columns
+    whose type differs between years (int vs float, all-null) are promoted.
+    A request can be listed under more than one year, so dedupe after reading.
+    """
+    tables = []
+    for path in year_files:
+        available = set(pq.read_schema(path).names)
+        tables.append(pq.read_table(path, columns=[c for c in COLUMNS_311 if c in available]))
+    df = pa.concat_tables(tables, promote_options='permissive').to_pandas()
+    
+    if 'servicerequestnum' in df.columns:
+        df = df.drop_duplicates(subset='servicerequestnum', ignore_index=True)
+    return df
+
+
 def cluster_locations(df):
     """
     Use DBSCAN to cluster 311 reports by geographic proximity.
-    Returns df with a 'cluster_id' column.
+    Returns an array of cluster labels aligned with df's rows
+    (-1 = noise: a singleton, not in any cluster).
     
     Reports within ~75 meters of each other are grouped into a cluster.
     This is how we find "same location, multiple reports."
     """
-    coords = df[['latitude', 'longitude']].values
-    
-    # Convert to radians for haversine metric
-    coords_rad = np.radians(coords)
+    lat = df['latitude'].to_numpy(dtype=np.float64)
+    lon = df['longitude'].to_numpy(dtype=np.float64)
     
-    # eps in radians
-    eps_rad = EPS_DEGREES * (np.pi / 180)
+    # Project to meters around the data's center. Baltimore spans a tiny
+    # latitude range, so plain Euclidean distance on this plane matches
+    # haversine to well under 0.1% — and lets DBSCAN use a KD-tree.
+    lat0 = np.radians(lat.mean())
+    xy = np.empty((len(df), 2), dtype=np.float32)
+    xy[:, 0] = (lon - lon.mean()) * np.cos(lat0) * METERS_PER_DEGREE_LAT
+    xy[:, 1] = (lat - lat.mean()) * METERS_PER_DEGREE_LAT
     
     db = DBSCAN(
-        eps=eps_rad,
+        eps=CLUSTER_EPS_METERS,
         min_samples=MIN_CLUSTER_SAMPLES,
-        algorithm='ball_tree',
-        metric='haversine'
-    ).fit(coords_rad)
-    
-    df = df.copy()
-    df['cluster_id'] = db.labels_  # -1 = noise (singleton, not in any cluster)
+        algorithm='kd_tree',
+        metric='euclidean',
+        n_jobs=-1
+    ).fit(xy)
     
-    return df
+    return db.labels_
 
 
 def build_report_history(group):
@@ -98,39 +149,69 @@ def build_report_history(group):
     flagging which ones are re-reports after a closure (possible failed fixes).
     Returns a list of dicts, one per report, sorted by date.
     """
-    sorted_reports = group.sort_values('createddate').reset_index(drop=True)
-    history = []
-    last_closure_date = None
-
-    for _, row in sorted_reports.iterrows():
-        created = row.get('createddate')
-        status_date = row.get('statusdate')
-        status = row.get('srstatus', '') or ''
-        srtype = row.get('srtype', '') or ''
-        sr_num = row.get('servicerequestnum', '') or ''
-        resolution = row.get('resolution_days')
-
-        # Is this a re-report after a recent closure?
-        is_rereport = False
-        if last_closure_date is not None and pd.notna(created):
-            days_since_closure = (created - last_closure_date).days
-            if 0 < days_since_closure <= FAILED_FIX_WINDOW_DAYS:
-                is_rereport = True
-
-        history.append({
-            'date': created.strftime('%Y-%m-%d') if pd.notna(created) else None,
+    sorted_reports = group.sort_values('createddate')
+    n = len(sorted_reports)
+
+    def column(name, default):
+        if name in sorted_reports.columns:
+            return sorted_reports[name].to_numpy()
+        return np.full(n, default, dtype=object)
+
+    created = sorted_reports['createddate'].to_numpy(dtype='datetime64[ns]')
+    status_dates = column('statusdate', None).astype('datetime64[ns]')
+    statuses = [s if isinstance(s, str) else '' for s in column('srstatus', '')]
+
+    # Most recent closure *before* each report: index of the last closed row
+    # so far (running max), shifted down one row
+    is_closed = np.array(['closed' in s.lower() for s in statuses], dtype=bool) & ~np.isnat(status_dates)
+    last_closed_idx = np.maximum.accumulate(np.where(is_closed, np.arange(n), -1))
+    prev_idx = np.concatenate(([-1], last_closed_idx[:-1]))
+    last_closure = np.where(prev_idx >= 0, status_dates[prev_idx], np.datetime64('NaT'))
+
+    # Is this a re-report after a recent closure? Same as
+    # 0 < whole days since closure <= FAILED_FIX_WINDOW_DAYS; NaT compares False
+    since_closure = created - last_closure
+    is_rereport = (
+        (since_closure >= np.timedelta64(1, 'D')) &
+        (since_closure < np.timedelta64(FAILED_FIX_WINDOW_DAYS + 1, 'D'))
+    )
+
+    dates = np.datetime_as_string(created, unit='D')
+
+    return [
+        {
+            'date': date if date != 'NaT' else None,
             'status': status,
-            'srtype': srtype,
+            'srtype': srtype or '',
             'sr_num': str(sr_num)[:20] if sr_num else None,
-            'resolution_days': int(resolution) if pd.notna(resolution) and resolution == resolution else None,
-            'is_rereport': is_rereport,
-        })
-
-        # Track most recent closure date
-        if 'closed' in status.lower() and pd.notna(status_date):
-            last_closure_date = status_date
-
-    return history
+            'resolution_days': int(res) if pd.notna(res) else None,
+            'is_rereport': bool(rereport),
+        }
+        for date, status, srtype, sr_num, res, rereport in zip(
+            dates,
+            statuses,
+            column('srtype', ''),
+            column('servicerequestnum', ''),
+            column('resolution_days', None),
+            is_rereport,
+        )
+    ]
+
+
+def most_common_by_cluster(clustered, col):
+    """
+    Most frequent non-null value of `col` in each cluster, as a Series
+    indexed by cluster_id. Ties go to the smallest value, like Series.mode().
+    """
+    if col not in clustered.columns:
+        return pd.Series(dtype=object)
+    counts = clustered.groupby(['cluster_id', col], observed=True).size()
+    counts = counts.sort_values(ascending=False, kind='stable')
+    top = counts[~counts.index.get_level_values('cluster_id').duplicated()]
+    return pd.Series(
+        top.index.get_level_values(col),
+        index=top.index.get_level_values('cluster_id'),
+    )
 
 
 def identify_chronic_hotspots(df):
@@ -142,42 +223,62 @@ def identify_chronic_hotspots(df):
     - Spans >= CHRONIC_MIN_DAYS_SPAN days between first and most recent report
     """
     # Only work with clustered points (exclude singletons)
-    clustered = df[df['cluster_id'] >= 0].copy()
+    clustered = df[df['cluster_id'] >= 0]
     
     if clustered.empty:
         return pd.DataFrame()
     
+    # One pass over the clustered frame for the per-cluster scalars, then
+    # keep only the clusters that clear the chronic thresholds
+    groups = clustered.groupby('cluster_id', observed=True, sort=False)
+    stats = groups.agg(
+        report_count=('createddate', 'size'),
+        first_report=('createddate', 'min'),
+        last_report=('createddate', 'max'),
+        centroid_lat=('latitude', 'mean'),
+        centroid_lon=('longitude', 'mean'),
+    )
+    stats['span_days'] = (stats['last_report'] - stats['first_report']).dt.days
+    stats = stats[
+        (stats['report_count'] >= CHRONIC_MIN_REPORTS) &
+        (stats['span_days'] >= CHRONIC_MIN_DAYS_SPAN)
+    ]
+    
+    # Most clusters are small DBSCAN pairs that never qualify; drop their rows
+    # so the per-cluster work below only touches chronic candidates
+    clustered = clustered[clustered['cluster_id'].isin(stats.index)]
+    
+    # Median resolution time of closed requests, per cluster
+    median_resolution = pd.Series(dtype=float)
+    if 'srstatus' in clustered.columns and 'resolution_days' in clustered.columns:
+        closed = clustered[clustered['srstatus'] == 'Closed']
+        median_resolution = closed.groupby('cluster_id', observed=True, sort=False)['resolution_days'].median()
+    
+    # Most common srtype / neighborhood / street for every cluster at once
+    primary_types = most_common_by_cluster(clustered, 'srtype')
+    neighborhoods = most_common_by_cluster(clustered, 'neighborhood')
+    streets = most_common_by_cluster(clustered, 'street')
+    
     hotspots = []
     
-    for cluster_id, group in clustered.groupby('cluster_id'):
-        report_count = len(group)
-        first_report = group['createddate'].min()
-        last_report = group['createddate'].max()
-        span_days = (last_report - first_report).days
-        
-        if report_count < CHRONIC_MIN_REPORTS or span_days < CHRONIC_MIN_DAYS_SPAN:
-            continue
-        
-        # Centroid of the cluster
-        centroid_lat = group['latitude'].mean()
-        centroid_lon = group['longitude'].mean()
+    # Hotspots are re-sorted by severity at the end, so group order doesn't matter
+    groups = clustered.groupby('cluster_id', observed=True, sort=False)
+    for cluster_id, group in groups:
+        row = stats.loc[cluster_id]
+        report_count = int(row.report_count)
+        first_report = row.first_report
+        last_report = row.last_report
+        span_days = int(row.span_days)
         
-        # Most common service type in this cluster
-        _srtype_mode = group['srtype'].mode() if 'srtype' in group.columns else pd.Series()
-        primary_type = _srtype_mode.iloc[0] if not _srtype_mode.empty else 'Unknown'
-
-        # Most common neighborhood
-        _nbhd_mode = group['neighborhood'].dropna().mode() if 'neighborhood' in group.columns else pd.Series()
-        neighborhood = _nbhd_mode.iloc[0] if not _nbhd_mode.empty else 'Unknown'
+        # Most common service type / neighborhood in this cluster
+        primary_type = primary_types.get(cluster_id, 'Unknown')
+        neighborhood = neighborhoods.get(cluster_id, 'Unknown')
         
         # Status breakdown
         status_counts = group['srstatus'].value_counts().to_dict() if 'srstatus' in group.columns else {}
         
         # Avg resolution time (for closed requests)
-        closed = group[group['srstatus'] == 'Closed']
-        avg_resolution_days = None
-        if not closed.empty and 'resolution_days' in closed.columns:
-            avg_resolution_days = closed['resolution_days'].median()
+        avg_resolution_days = median_resolution.get(cluster_id)
         
         # Chronic severity score (higher = more concerning)
         # Formula: reports * (1 + log of span in months)
@@ -189,10 +290,7 @@ def identify_chronic_hotspots(df):
         possible_failed_fixes = detect_failed_fixes(group)
         
         # Address hint — use most common street if available
-        address_hint = None
-        if 'street' in group.columns:
-            _street_mode = group['street'].dropna().mode()
-            address_hint = _street_mode.iloc[0] if not _street_mode.empty else None
+        address_hint = streets.get(cluster_id)
         
         # Build per-report history for the timeline view
         # Include all reports sorted by date, flagging re-reports after closures
@@ -200,8 +298,8 @@ def identify_chronic_hotspots(df):
 
         hotspots.append({
             'cluster_id': int(cluster_id),
-            'latitude': round(centroid_lat, 6),
-            'longitude': round(centroid_lon, 6),
+            'latitude': round(float(row.centroid_lat), 6),
+            'longitude': round(float(row.centroid_lon), 6),
             'report_count': report_count,
             'first_report': first_report.isoformat(),
             'last_report': last_report.isoformat(),
@@ -233,26 +331,19 @@ def detect_failed_fixes(group):
     if 'srstatus' not in group.columns or 'createddate' not in group.columns:
         return 0
     
-    sorted_reports = group.sort_values('createddate')
-    failed_fixes = 0
+    created = group['createddate'].to_numpy(dtype='datetime64[ns]')
+    created = np.sort(created[~np.isnat(created)])
     
-    for i, row in sorted_reports.iterrows():
-        if row['srstatus'] != 'Closed' or pd.isna(row['statusdate']):
-            continue
-        
-        closure_date = row['statusdate']
-        window_end = closure_date + timedelta(days=FAILED_FIX_WINDOW_DAYS)
-        
-        # Were there new reports after this closure?
-        subsequent = sorted_reports[
-            (sorted_reports['createddate'] > closure_date) &
-            (sorted_reports['createddate'] <= window_end)
-        ]
-        
-        if not subsequent.empty:
-            failed_fixes += 1
+    status_dates = group['statusdate'].to_numpy(dtype='datetime64[ns]')
+    closed_mask = (group['srstatus'] == 'Closed').to_numpy() & ~np.isnat(status_dates)
+    closures = status_dates[closed_mask]
     
-    return failed_fixes
+    # For every closure at once: were there new reports in (closure, closure + window]?
+    window = np.timedelta64(FAILED_FIX_WINDOW_DAYS, 'D')
+    lo = np.searchsorted(created, closures, side='right')
+    hi = np.searchsorted(created, closures + window, side='right')
+    
+    return int((hi > lo).sum())
 
 
 def neighborhood_summary(df):
@@ -265,7 +356,12 @@ def neighborhood_summary(df):
     
     summary = {}
     
-    for neighborhood, group in df.groupby('neighborhood'):
+    # Trend windows: last 90 days vs the 90 days before that
+    now = datetime.now()
+    recent_cutoff = np.datetime64(now - timedelta(days=90), 'ns')
+    prior_cutoff = np.datetime64(now - timedelta(days=180), 'ns')
+    
+    for neighborhood, group in df.groupby('neighborhood', observed=True):
         if pd.isna(neighborhood) or neighborhood == '':
             continue
         
@@ -289,11 +385,13 @@ def neighborhood_summary(df):
             if not closed_times.empty:
                 avg_res_days = round(closed_times.median(), 1)
         
-        # Trend: reports in last 90 days vs previous 90 days
-        recent_cutoff = datetime.now() - timedelta(days=90)
-        prior_cutoff = datetime.now() - timedelta(days=180)
-        recent = len(group[group['createddate'] >= recent_cutoff])
-        prior = len(group[(group['createddate'] >= prior_cutoff) & (group['createddate'] < recent_cutoff)])
+        # Trend: reports in last 90 days vs previous 90 days, counted by
+        # binary search over the sorted dates instead of boolean masks
+        dates = group['createddate'].to_numpy(dtype='datetime64[ns]')
+        dates = np.sort(dates[~np.isnat(dates)])
+        i_prior, i_recent = np.searchsorted(dates, [prior_cutoff, recent_cutoff])
+        recent = int(len(dates) - i_recent)
+        prior = int(i_recent - i_prior)
         
         trend = None
         if prior > 0:
@@ -314,6 +412,22 @@ def neighborhood_summary(df):
     return summary
 
 
+def parse_location_hints(hints_raw):
+    """
+    Split a post's location_hints cell into a list. fetch_reddit.py stores
+    the hints '|'-joined; CSVs from older fetches hold a JSON-encoded list.
+    """
+    if not isinstance(hints_raw, str) or not hints_raw:
+        return []
+    if not hints_raw.startswith('['):
+        return hints_raw.split('|')
+    try:
+        hints = orjson.loads(hints_raw)
+    except orjson.JSONDecodeError:
+        hints = []
+    return hints if isinstance(hints, list) else []
+
+
 def gap_analysis(df_311, df_reddit):
     """
     Identify neighborhoods with Reddit signal but low 311 activity.
@@ -332,24 +446,25 @@ def gap_analysis(df_311, df_reddit):
     if df_311 is not None and 'neighborhood' in df_311.columns:
         report_counts = df_311['neighborhood'].value_counts().to_dict()
     
-    # Extract neighborhood mentions from Reddit location hints
+    # Extract neighborhood mentions from Reddit location hints.
+    # Parse each post's hints once and count every distinct (lowercased) hint,
+    # so matching below runs over a few hundred unique strings, not every row.
+    if 'location_hints' in df_reddit.columns:
+        parsed = df_reddit['location_hints'].map(parse_location_hints)
+    else:
+        parsed = pd.Series([], dtype=object)
+    hint_counts = parsed.explode().dropna().astype(str).str.lower().value_counts()
+    hint_text = hint_counts.index.to_series()
+    
     reddit_neighborhood_signals = {}
     
-    for _, row in df_reddit.iterrows():
-        hints_raw = row.get('location_hints', '[]')
-        try:
-            hints = json.loads(hints_raw) if isinstance(hints_raw, str) else []
-        except (json.JSONDecodeError, TypeError):
-            hints = []
-        
-        for hint in hints:
-            hint_lower = hint.lower()
-            # Match against known neighborhoods (simple substring match)
-            for neighborhood in report_counts.keys():
-                if neighborhood.lower() in hint_lower or hint_lower in neighborhood.lower():
-                    reddit_neighborhood_signals[neighborhood] = (
-                        reddit_neighborhood_signals.get(neighborhood, 0) + 1
-                    )
+    for neighborhood in report_counts.keys():
+        # Match against known neighborhoods (simple substring match, either way round)
+        nb = neighborhood.lower()
+        matched = hint_text.str.contains(nb, regex=False) | hint_text.map(nb.__contains__)
+        signal = int(hint_counts[matched.to_numpy(dtype=bool)].sum())
+        if signal:
+            reddit_neighborhood_signals[neighborhood] = signal
     
     # Identify gaps: high Reddit signal, low 311 count
     gaps = []
@@ -386,20 +501,6 @@ def category_fix_rates(df_311, hotspots_list):
     This answers: "Out of all pothole requests, what % appear to be failed fixes
     at chronic locations?"
     """
-    def categorize_type(srtype):
-        if not srtype:
-            return 'Other'
-        t = str(srtype).lower()
-        if 'pothole' in t: return 'Pothole'
-        if 'light' in t or 'streetlight' in t: return 'Street Light'
-        if 'alley' in t: return 'Alley'
-        if 'sidewalk' in t: return 'Sidewalk'
-        if 'water' in t or 'main' in t: return 'Water Main'
-        if 'cave' in t or 'sinkhole' in t: return 'Cave-In / Sinkhole'
-        if 'storm' in t or 'drain' in t or 'catch' in t: return 'Storm Drain'
-        if 'curb' in t or 'bridge' in t or 'street' in t: return 'Street / Curb'
-        return 'Other'
-
     if df_311 is None or df_311.empty:
         return {}
 
@@ -407,38 +508,28 @@ def category_fix_rates(df_311, hotspots_list):
     if 'srtype' not in df_311.columns:
         return {}
 
-    # Build a lookup: cluster_id -> (total_rereports, total_reports_in_cluster)
-    cluster_rereports = {}
-    cluster_total = {}
+    # Sum re-reports and reports across hotspots, keyed by the category
+    # their primary_type maps to — one pass over the hotspot list
+    hotspot_totals = {}
     for h in hotspots_list:
-        cid = h.get('cluster_id')
-        if cid is None:
-            continue
+        cat = categorize_type(h.get('primary_type', ''))
         history = h.get('history', [])
-        cluster_rereports[cid] = sum(1 for r in history if r.get('is_rereport'))
-        cluster_total[cid] = len(history)
-
-    # Map each 311 record to its category
-    df = df_311.copy()
-    df['_category'] = df['srtype'].apply(categorize_type)
+        rereports, reports = hotspot_totals.get(cat, (0, 0))
+        hotspot_totals[cat] = (
+            rereports + sum(1 for r in history if r.get('is_rereport')),
+            reports + len(history),
+        )
+
+    # Map each 311 record to its category. srtype has only a few dozen
+    # distinct values, so categorize those once and map the column.
+    # Kept as a standalone Series and grouped on directly — no copy of df_311.
+    cat_map = {t: categorize_type(t) for t in df_311['srtype'].dropna().unique()}
+    categories = df_311['srtype'].map(cat_map).fillna('Other').astype('category')
 
     stats = {}
-    for cat, group in df.groupby('_category'):
+    for cat, group in df_311.groupby(categories, observed=True):
         total = len(group)
-
-        # How many of these are in a chronic cluster? (unused directly, computed via hotspots below)
-        clustered_count = 0
-
-        # Sum rereports across all clusters of this category
-        # We do this by summing from hotspots whose primary_type maps to this category
-        cat_rereports = 0
-        cat_cluster_reports = 0
-        for h in hotspots_list:
-            if categorize_type(h.get('primary_type', '')) != cat:
-                continue
-            history = h.get('history', [])
-            cat_rereports += sum(1 for r in history if r.get('is_rereport'))
-            cat_cluster_reports += len(history)
+        cat_rereports, cat_cluster_reports = hotspot_totals.get(cat, (0, 0))
 
         recurrence_pct = round(cat_rereports / total * 100, 1) if total > 0 else 0
         cluster_pct = round(cat_cluster_reports / total * 100, 1) if total > 0 else 0
@@ -469,13 +560,13 @@ def main():
     
     # Step 1: Cluster by location
     print("Step 1/4: Clustering by location...")
-    df_clustered = cluster_locations(df_311)
-    n_clusters = len(df_clustered[df_clustered['cluster_id'] >= 0]['cluster_id'].unique())
+    df_311['cluster_id'] = cluster_locations(df_311)
+    n_clusters = df_311.loc[df_311['cluster_id'] >= 0, 'cluster_id'].nunique()
     print(f"  Found {n_clusters:,} location clusters")
     
     # Step 2: Identify chronic hotspots
     print("Step 2/4: Identifying chronic hotspots...")
-    hotspots_df = identify_chronic_hotspots(df_clustered)
+    hotspots_df = identify_chronic_hotspots(df_311)
     n_hotspots = len(hotspots_df) if not hotspots_df.empty else 0
     n_high_priority = hotspots_df['is_high_priority'].sum() if not hotspots_df.empty else 0
     print(f"  Found {n_hotspots:,} chronic hotspots ({n_high_priority} high priority)")
@@ -526,8 +617,10 @@ def main():
         'category_stats': cat_stats,
     }
     
-    with open(OUTPUT_PATH, 'w') as f:
-        json.dump(output, f, indent=2, default=str)
+    # orjson serializes the numpy scalars left in the hotspot records natively;
+    # dates are already isoformat strings, so no fallback encoder is needed
+    with open(OUTPUT_PATH, 'wb') as f:
+        f.write(orjson.dumps(output, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
     
     print(f"\nAnalysis saved to: {OUTPUT_PATH}")
     
@@ -0,0 +1,38 @@
+"""
+categories.py
+
+Broad request categories shared by analyze.py (fix rates per category) and
+generate_dashboard.py (filter chips and marker colors), so the two can never
+disagree about which category a srtype belongs to.
+"""
+
+import re
+from functools import lru_cache
+
+# Broad request categories and the srtype keywords that map to them, in
+# priority order: "Street Light Out" is a Street Light, not a Street / Curb
+CATEGORY_KEYWORDS = [
+    ('Pothole', ['pothole']),
+    ('Street Light', ['light', 'streetlight']),
+    ('Alley', ['alley']),
+    ('Sidewalk', ['sidewalk']),
+    ('Water Main', ['water', 'main']),
+    ('Cave-In / Sinkhole', ['cave', 'sinkhole']),
+    ('Storm Drain', ['storm', 'drain', 'catch']),
+    ('Street / Curb', ['curb', 'bridge', 'street']),
+]
+_KEYWORD_RANK = {kw: rank for rank, (_, kws) in enumerate(CATEGORY_KEYWORDS) for kw in kws}
+# A zero-width lookahead tries every position, so one scan finds every
+# keyword in the string (overlapping ones included), not just the leftmost
+_CATEGORY_RE = re.compile(
+    '(?=(' + '|'.join(re.escape(kw) for kw in sorted(_KEYWORD_RANK, key=len, reverse=True)) + '))'
+)
+
+
+@lru_cache(maxsize=None)
+def categorize_type(srtype):
+    """Map a raw srtype string to a broad request category."""
+    if not srtype:
+        return 'Other'
+    ranks = [_KEYWORD_RANK[kw] for kw in _CATEGORY_RE.findall(str(srtype).lower())]
+    return CATEGORY_KEYWORDS[min(ranks)][0] if ranks else 'Other'
@@ -14,14 +14,20 @@ Datasets available: 2010–2026 (we default to 2020–2026 for chronic analysis)
 
 import requests
 import pandas as pd
+import pyarrow as pa
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from tqdm import tqdm
 import os
+import threading
 import time
 
 # --- Configuration ---
 
-OUTPUT_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', '311_requests.csv')
+# One Parquet file per year, written as soon as that year is fetched
+OUTPUT_DIR = os.path.join(os.path.dirname(__file__), '..', 'data', '311_requests')
 
 ARCGIS_ORG = "UWYHeuuJISiGmgXx"
 BASE_URL = f"https://services1.arcgis.com/{ARCGIS_ORG}/arcgis/rest/services"
@@ -36,6 +42,18 @@ YEARS_TO_FETCH = [2026, 2025, 2024, 2023, 2022, 2021, 2020]
 # ArcGIS max records per page
 PAGE_SIZE = 2000
 
+# Requests in flight at once, across all years (also the HTTP pool size)
+MAX_CONNECTIONS = 16
+
+# Minimum gap between request starts, shared by every thread, to stay
+# polite to the public endpoint
+REQUEST_INTERVAL = 0.15
+
+# Throttled (429) and server-error responses are retried with exponential
+# backoff, honoring any Retry-After the server sends
+RETRY = Retry(total=5, backoff_factor=1, status_forcelist=(429, 500, 502, 503, 504),
+              allowed_methods=("GET",), respect_retry_after_header=True)
+
 # Infrastructure-related service request types (SQL LIKE matching on SRType field)
 INFRASTRUCTURE_KEYWORDS = [
     "Pothole",
@@ -55,6 +73,33 @@ INFRASTRUCTURE_KEYWORDS = [
 ]
 
 
+def make_session():
+    """One pooled HTTP session shared by every fetch thread."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=MAX_CONNECTIONS, pool_maxsize=MAX_CONNECTIONS,
+                          max_retries=RETRY)
+    session.mount("https://", adapter)
+    return session
+
+
+SESSION = make_session()
+
+_request_lock = threading.Lock()
+_next_request_at = 0.0
+
+
+def throttled_get(url, **kwargs):
+    """SESSION.get, with request starts spaced REQUEST_INTERVAL apart across all threads."""
+    global _next_request_at
+    with _request_lock:
+        now = time.monotonic()
+        start = max(now, _next_request_at)
+        _next_request_at = start + REQUEST_INTERVAL
+    if start > now:
+        time.sleep(start - now)
+    return SESSION.get(url, **kwargs)
+
+
 def build_where_clause():
     conditions = [f"SRType LIKE '%{kw}%'" for kw in INFRASTRUCTURE_KEYWORDS]
     return "(" + " OR ".join(conditions) + ")"
@@ -64,7 +109,7 @@ def get_field_names(year):
     """Fetch the field schema for a year's endpoint."""
     url = f"{endpoint_for_year(year)}?f=json"
     try:
-        resp = requests.get(url, timeout=15)
+        resp = throttled_get(url, timeout=15)
         resp.raise_for_status()
         data = resp.json()
         if "error" in data:
@@ -75,65 +120,206 @@ def get_field_names(year):
         return None, str(e)
 
 
-def fetch_year(year):
-    """Paginate through all matching records for a given year."""
-    query_url = f"{endpoint_for_year(year)}/query"
+def get_record_count(year, where_clause):
+    """Ask ArcGIS how many records match, so every page can be requested up front."""
+    params = {"where": where_clause, "returnCountOnly": "true", "f": "json"}
+    try:
+        resp = throttled_get(f"{endpoint_for_year(year)}/query", params=params, timeout=30)
+        resp.raise_for_status()
+        data = resp.json()
+        if "error" in data:
+            return None, data["error"].get("message", "ArcGIS error")
+        return data.get("count", 0), None
+    except Exception as e:
+        return None, str(e)
+
+
+def attributes_to_table(attrs):
+    """
+    Build an Arrow table from one page's attribute dicts. Arrow rejects a
+    field whose values mix types within the page (e.g. zipcode as int and
+    string); such pages go through pandas instead, with the mixed fields
+    stored as text, so none of their records are lost.
+    """
+    try:
+        return pa.Table.from_pylist(attrs)
+    except pa.ArrowException:
+        df = pd.DataFrame(attrs)
+        for col in df.columns[df.dtypes == object]:
+            if pd.api.types.infer_dtype(df[col]) in ("mixed", "mixed-integer"):
+                df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+        return pa.Table.from_pandas(df, preserve_index=False)
+
+
+def features_to_table(features, year):
+    """Convert one page of ArcGIS features to a columnar Arrow table."""
+    geoms = [f.get("geometry") or {} for f in features]
+    table = attributes_to_table([f.get("attributes", {}) for f in features])
+    table = table.append_column("longitude", pa.array([g.get("x") for g in geoms], pa.float64()))
+    table = table.append_column("latitude", pa.array([g.get("y") for g in geoms], pa.float64()))
+    return table.append_column("_source_year", pa.array([year] * len(features), pa.int16()))
+
+
+def common_type(types):
+    """The one Arrow type a field seen with these (non-null) types is cast to."""
+    if not types:
+        return pa.null()
+    if len(types) == 1:
+        return next(iter(types))
+    if all(pa.types.is_integer(t) for t in types):
+        return pa.int64()
+    if all(pa.types.is_integer(t) or pa.types.is_floating(t) for t in types):
+        return pa.float64()
+    return pa.string()
+
+
+def unify_schema(tables):
+    """
+    Cast a year's page tables to one shared schema. ArcGIS pages don't always
+    agree on a field's type: int vs. double (e.g. epoch-ms dates) becomes
+    float64 so the field stays numeric; genuinely mixed types (zipcode as
+    int on one page, string on the next) become strings. All-null columns
+    take the type seen on other pages, and fields missing from a page are
+    filled with nulls.
+    """
+    types = {}
+    for table in tables:
+        for field in table.schema:
+            seen = types.setdefault(field.name, set())
+            if not pa.types.is_null(field.type):
+                seen.add(field.type)
+    schema = pa.schema([(name, common_type(seen)) for name, seen in types.items()])
+
+    unified = []
+    for table in tables:
+        columns = [
+            table.column(field.name).cast(field.type) if field.name in table.column_names
+            else pa.nulls(table.num_rows, field.type)
+            for field in schema
+        ]
+        unified.append(pa.Table.from_arrays(columns, schema=schema))
+    return unified
+
+
+def fetch_page(year, where_clause, offset):
+    """Fetch one page starting at offset, as an Arrow table (None on failure)."""
+    params = {
+        "where": where_clause,
+        "outFields": "*",
+        "returnGeometry": "true",
+        "outSR": "4326",
+        "f": "json",
+        # A stable order keeps offset pages from overlapping or skipping records
+        "orderByFields": "OBJECTID",
+        "resultOffset": offset,
+        "resultRecordCount": PAGE_SIZE,
+    }
+    try:
+        resp = throttled_get(f"{endpoint_for_year(year)}/query", params=params, timeout=30)
+        resp.raise_for_status()
+        data = resp.json()
+    except requests.RequestException as e:
+        print(f"\n  [{year}] Network error at offset {offset}: {e}")
+        return None
+    except ValueError as e:
+        print(f"\n  [{year}] Bad JSON at offset {offset}: {e}")
+        return None
+
+    if "error" in data:
+        print(f"\n  [{year}] ArcGIS error at offset {offset}: {data['error']}")
+        return None
+
+    features = data.get("features", [])
+    if not features:
+        return None
+    try:
+        return features_to_table(features, year)
+    except pa.ArrowException as e:
+        print(f"\n  [{year}] Unconvertible page at offset {offset}: {e}")
+        return None
+
+
+def fetch_year(year, page_pool):
+    """
+    Fetch all matching records for a given year, with its pages in flight
+    concurrently. Each page is converted to an Arrow table as it arrives,
+    so the raw JSON features never pile up for the whole year.
+    Returns (df, failed) — failed counts pages that errored or came back empty.
+    """
     where_clause = build_where_clause()
-    all_features = []
-    offset = 0
-
-    with tqdm(desc=f"  {year}", unit=" rec", leave=False) as pbar:
-        while True:
-            params = {
-                "where": where_clause,
-                "outFields": "*",
-                "returnGeometry": "true",
-                "outSR": "4326",
-                "f": "json",
-                "resultOffset": offset,
-                "resultRecordCount": PAGE_SIZE,
-            }
-            try:
-                resp = requests.get(query_url, params=params, timeout=30)
-                resp.raise_for_status()
-                data = resp.json()
-            except requests.RequestException as e:
-                print(f"\n  Network error at offset {offset}: {e}")
-                break
-            except ValueError as e:
-                print(f"\n  Bad JSON at offset {offset}: {e}")
-                break
-
-            if "error" in data:
-                print(f"\n  ArcGIS error: {data['error']}")
-                break
-
-            features = data.get("features", [])
-            if not features:
-                break
-
-            all_features.extend(features)
-            pbar.update(len(features))
-
-            if not data.get("exceededTransferLimit", False):
-                break
-
-            offset += PAGE_SIZE
-            time.sleep(0.15)
-
-    return all_features
-
-
-def features_to_df(features, year):
-    rows = []
-    for f in features:
-        row = dict(f.get("attributes", {}))
-        geom = f.get("geometry", {})
-        row["longitude"] = geom.get("x")
-        row["latitude"] = geom.get("y")
-        row["_source_year"] = year
-        rows.append(row)
-    return pd.DataFrame(rows)
+    total, err = get_record_count(year, where_clause)
+    if err:
+        print(f"\n  [{year}] Could not count records: {err}")
+        return pd.DataFrame(), 0
+
+    offsets = range(0, total, PAGE_SIZE)
+    pages = {}
+
+    with tqdm(total=total, desc=f"  {year}", unit=" rec", leave=False,
+              position=YEARS_TO_FETCH.index(year)) as pbar:
+        futures = {page_pool.submit(fetch_page, year, where_clause, o): o for o in offsets}
+        for future in as_completed(futures):
+            table = future.result()
+            if table is not None:
+                pages[futures[future]] = table
+                pbar.update(table.num_rows)
+
+    failed = len(offsets) - len(pages)
+    if not pages:
+        return pd.DataFrame(), failed
+
+    # Reassemble in offset order so the output doesn't depend on completion order
+    tables = [pages[o] for o in offsets if o in pages]
+    try:
+        return pa.concat_tables(unify_schema(tables)).to_pandas(), failed
+    except pa.ArrowException as e:
+        print(f"\n  [{year}] Could not combine pages: {e}")
+        return pd.DataFrame(), failed
+
+
+def fetch_and_save_year(year, page_pool):
+    """
+    Fetch, normalize and write one year end to end, so only that year's
+    frame is ever held in memory. Returns (stats, message) — stats is a
+    small summary for the final report, or None on failure.
+    """
+    fields, err = get_field_names(year)
+    if err:
+        return None, f"⚠️  Could not reach {year}: {err}"
+
+    df, failed = fetch_year(year, page_pool)
+    if df.empty:
+        return None, f"No records returned ({len(fields)} fields, {failed} failed pages)"
+
+    df = normalize_df(df, year)
+
+    # Deduplicate on service request number
+    message = f"✓ {len(fields)} fields → {len(df):,} usable records"
+    id_col = next((c for c in ["servicerequestnum", "sr_record_id", "OBJECTID"] if c in df.columns), None)
+    if id_col:
+        before = len(df)
+        df = df.drop_duplicates(subset=id_col)
+        if before - len(df):
+            message += f" ({before - len(df):,} duplicates on {id_col} removed)"
+    if failed:
+        message += f" — ⚠️  {failed} page(s) failed, year is incomplete"
+
+    save_year(df, year)
+
+    dates = df["createddate"].dropna() if "createddate" in df.columns else pd.Series(dtype="datetime64[ns]")
+    stats = {
+        "records": len(df),
+        "types": df["srtype"].value_counts() if "srtype" in df.columns else pd.Series(dtype=int),
+        "first": dates.min() if not dates.empty else None,
+        "last": dates.max() if not dates.empty else None,
+    }
+    return stats, message
+
+
+def save_year(df, year):
+    """Write one year's records to OUTPUT_DIR/year=YYYY.parquet."""
+    path = os.path.join(OUTPUT_DIR, f"year={year}.parquet")
+    df.to_parquet(path, engine="pyarrow", compression="zstd", index=False)
 
 
 def normalize_df(df, year):
@@ -179,14 +365,16 @@ def normalize_df(df, year):
             else:
                 df[col] = pd.to_datetime(df[col], errors='coerce')
 
-    for col in ["latitude", "longitude"]:
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors='coerce')
+    # float32 is plenty for coordinates inside one city (~1 m resolution)
+    # and halves what clustering and centroid math has to read
+    lat = pd.to_numeric(df["latitude"], errors='coerce').astype("float32")
+    lon = pd.to_numeric(df["longitude"], errors='coerce').astype("float32")
 
     before = len(df)
-    df = df.dropna(subset=["latitude", "longitude"])
-    # Sanity-check: keep only points inside Baltimore's bounding box
-    df = df[df["latitude"].between(39.1, 39.5) & df["longitude"].between(-76.9, -76.4)]
+    # Sanity-check: keep only points inside Baltimore's bounding box.
+    # One mask (missing coords fail `between` too), one copy of the frame.
+    mask = lat.between(39.1, 39.5) & lon.between(-76.9, -76.4)
+    df = df.loc[mask].assign(latitude=lat[mask], longitude=lon[mask])
     dropped = before - len(df)
     if dropped:
         print(f"  Dropped {dropped} rows (no coords or outside Baltimore)")
@@ -196,13 +384,18 @@ def normalize_df(df, year):
         df["days_since_created"] = (datetime.now() - df["createddate"]).dt.days
 
     if "neighborhood" in df.columns:
-        df["neighborhood"] = df["neighborhood"].astype(str).str.strip().str.title()
+        # Nullable string dtype keeps missing neighborhoods as nulls instead
+        # of the literal "None"/"Nan" that astype(str) would produce
+        df["neighborhood"] = df["neighborhood"].astype("string").str.strip().str.title()
+        suspect = df["neighborhood"].isin(["None", "Nan"]).sum()
+        if suspect:
+            print(f"\n  [{year}] ⚠️  {suspect} neighborhood values read 'None'/'Nan' — check the source data")
 
     return df
 
 
 def main():
-    os.makedirs(os.path.dirname(OUTPUT_PATH), exist_ok=True)
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
 
     print("Baltimore 311 Infrastructure Data Fetcher")
     print("=" * 55)
@@ -211,59 +404,49 @@ def main():
     print(f"Endpoint: {BASE_URL}/311_Customer_Service_Requests_YYYY/FeatureServer/0")
     print()
 
-    all_dfs = []
-
-    for year in YEARS_TO_FETCH:
-        print(f"[{year}] Checking fields...")
-        fields, err = get_field_names(year)
-
-        if err:
-            print(f"  ⚠️  Could not reach {year}: {err}\n")
-            continue
+    # Years run concurrently; their pages share one pool so the total number
+    # of requests in flight stays at MAX_CONNECTIONS. Each year is written
+    # to disk by its own worker, overlapping with the other years' fetches.
+    with ThreadPoolExecutor(max_workers=MAX_CONNECTIONS) as page_pool, \
+            ThreadPoolExecutor(max_workers=len(YEARS_TO_FETCH)) as year_pool:
+        results = list(year_pool.map(lambda y: fetch_and_save_year(y, page_pool), YEARS_TO_FETCH))
 
-        print(f"  ✓ {len(fields)} fields — fetching records...")
-        features = fetch_year(year)
+    # Running totals for the report — the years are never combined in memory
+    total_records = 0
+    type_counts = pd.Series(dtype=int)
+    first, last = None, None
 
-        if not features:
-            print(f"  No records returned\n")
+    print()
+    for year, (stats, message) in zip(YEARS_TO_FETCH, results):
+        print(f"[{year}] {message}")
+        if stats is None:
             continue
+        total_records += stats["records"]
+        type_counts = type_counts.add(stats["types"], fill_value=0)
+        if stats["first"] is not None:
+            first = stats["first"] if first is None else min(first, stats["first"])
+            last = stats["last"] if last is None else max(last, stats["last"])
+    print()
 
-        df = features_to_df(features, year)
-        df = normalize_df(df, year)
-        print(f"  → {len(df):,} usable records\n")
-        all_dfs.append(df)
-
-    if not all_dfs:
+    if not total_records:
         print("❌ No data fetched from any year.")
         return
 
-    combined = pd.concat(all_dfs, ignore_index=True)
-
-    # Deduplicate on service request number
-    id_col = next((c for c in ["servicerequestnum", "sr_record_id", "OBJECTID"] if c in combined.columns), None)
-    if id_col:
-        before = len(combined)
-        combined = combined.drop_duplicates(subset=id_col)
-        if before - len(combined):
-            print(f"Removed {before - len(combined):,} duplicates on {id_col}")
-
     print("=" * 55)
     print("FETCH COMPLETE")
     print("=" * 55)
-    print(f"Total records: {len(combined):,}")
+    # Requests listed under more than one year are deduplicated by analyze.py
+    print(f"Total records: {total_records:,}")
 
-    if "srtype" in combined.columns:
+    if not type_counts.empty:
         print(f"\nTop request types:")
-        for t, n in combined["srtype"].value_counts().head(12).items():
-            print(f"  {str(t):<48} {n:>6,}")
+        for t, n in type_counts.sort_values(ascending=False, kind="stable").head(12).items():
+            print(f"  {str(t):<48} {int(n):>6,}")
 
-    if "createddate" in combined.columns:
-        dates = combined["createddate"].dropna()
-        if not dates.empty:
-            print(f"\nDate range: {dates.min().date()} → {dates.max().date()}")
+    if first is not None:
+        print(f"\nDate range: {first.date()} → {last.date()}")
 
-    combined.to_csv(OUTPUT_PATH, index=False)
-    print(f"\n✓ Saved: {OUTPUT_PATH}")
+    print(f"\n✓ Saved: {OUTPUT_DIR}/year=YYYY.parquet")
     print(f"  Next: python scripts/analyze.py")
 
 
@@ -2,24 +2,82 @@
 fetch_reddit.py
 
 Pulls posts and comments from r/baltimore mentioning infrastructure problems.
-Uses PRAW (Python Reddit API Wrapper).
+Uses Async PRAW (the asyncio version of the Python Reddit API Wrapper).
 
 Requires a .env file with Reddit API credentials.
 See .env.example for setup instructions.
+
+Raw search results are cached for the day under data/.cache/reddit, so
+reruns (e.g. while tuning the scoring) don't hit the API again. Delete
+that directory to force a fresh fetch.
 """
 
 import os
 import re
-import json
-import pandas as pd
-import praw
-from datetime import datetime
+import time
+import asyncio
+import hashlib
+import multiprocessing
+import threading
+import orjson
+import asyncpraw
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from types import SimpleNamespace
 from dotenv import load_dotenv
 from tqdm import tqdm
 
+try:
+    import re2  # google-re2: linear-time matching, no backtracking
+except ImportError:
+    re2 = None
+
+try:
+    import hyperscan  # SIMD multi-literal matching for the keyword scans
+except ImportError:
+    hyperscan = None
+
 load_dotenv()
 
 OUTPUT_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'reddit_posts.csv')
+CACHE_DIR = os.path.join(os.path.dirname(__file__), '..', 'data', '.cache', 'reddit')
+
+# Raw post fields kept in the search cache; everything else is derived from them
+RAW_POST_FIELDS = ['id', 'title', 'selftext', 'permalink', 'score', 'num_comments', 'created_utc']
+
+# Searches run concurrently; Reddit's OAuth API allows 60 requests/minute
+MAX_CONCURRENT_SEARCHES = 8
+REQUESTS_PER_MINUTE = 60
+
+# Keyword scanning and scoring run in worker processes, in chunks of posts.
+# Workers are spawned, not forked: by the time the pool starts, asyncio and
+# aiohttp threads are running, and forking a process with live threads can
+# deadlock the child
+PROCESS_WORKERS = os.cpu_count() or 1
+PROCESS_CONTEXT = multiprocessing.get_context("spawn")
+PROCESS_CHUNK_SIZE = 16
+
+# Output columns, in CSV order. Posts are collected column-wise (one list
+# per column), with no per-post dict, and written as Arrow record batches.
+POST_SCHEMA = pa.schema([
+    ('post_id', pa.string()),
+    ('category', pa.string()),
+    ('search_query', pa.string()),
+    ('title', pa.string()),
+    ('text', pa.string()),
+    ('url', pa.string()),
+    ('score', pa.int64()),
+    ('num_comments', pa.int64()),
+    ('created_utc', pa.int64()),
+    ('location_hints', pa.string()),
+    ('location_hint_count', pa.int64()),
+    ('damage_intensity_score', pa.int64()),
+    ('is_chronic_signal', pa.bool_()),
+])
+POST_COLUMNS = POST_SCHEMA.names
 
 # --- Search configuration ---
 
@@ -84,14 +142,135 @@ BALTIMORE_SIGNALS = [
     "city council", "bpw", "dpw", "dot baltimore", "mayor",
 ]
 
-# Patterns for extracting street/location mentions from text
-STREET_PATTERNS = [
+# Patterns for extracting street/location mentions from text, compiled
+# once at import. They use nothing RE2 lacks, so RE2 runs them when it's
+# installed. RE2's \d, \s and \b are ASCII-only while re's are Unicode by
+# default (an accented letter counts as a word character for \b), so the
+# re fallback adds the inline (?a) flag to find the same matches.
+_street_re = re2 if re2 is not None else re
+_street_flags = '(?i)' if re2 is not None else '(?ai)'
+STREET_PATTERNS = [_street_re.compile(_street_flags + p) for p in (
     r'\b(\d+\s+(?:block\s+of\s+)?[A-Z][a-z]+(?:\s+[A-Z][a-z]+)?\s+(?:St|Street|Ave|Avenue|Blvd|Boulevard|Rd|Road|Dr|Drive|Ln|Lane|Way|Pkwy|Parkway|Ct|Court|Pl|Place))\b',
     r'\b([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?\s+(?:St|Street|Ave|Avenue|Blvd|Boulevard|Rd|Road|Dr|Drive|Ln|Lane|Way|Pkwy|Parkway))\b',
     r'\b((?:corner|intersection|near|at|on)\s+(?:of\s+)?[A-Z][a-z]+(?:\s+(?:and|&|\/)\s+[A-Z][a-z]+)?)\b',
-]
+)]
+
+
+class KeywordScanner:
+    """
+    Finds which of a fixed set of keywords occur as substrings of a text,
+    in one regex pass instead of one `in` scan per keyword. Texts are
+    UTF-8 bytes (see lower_bytes); the keywords found come back as str.
+    """
+    
+    def __init__(self, keywords):
+        keywords = list(dict.fromkeys(keywords))
+        # The zero-width lookahead is tried at every position and reports the
+        # longest keyword starting there, so overlapping keywords are all seen;
+        # keywords that are a prefix of the one reported ('damage' in
+        # 'damaged') are implied
+        longest_first = sorted(keywords, key=len, reverse=True)
+        self.pattern = re.compile(b'(?=(' + b'|'.join(re.escape(k.encode()) for k in longest_first) + b'))')
+        self.implied = {k.encode(): frozenset(w for w in keywords if k.startswith(w)) for k in keywords}
+    
+    def scan(self, body):
+        """The set of keywords found in body (case-sensitive)."""
+        found = set()
+        for keyword in self.pattern.findall(body):
+            found |= self.implied[keyword]
+        return found
+
+
+class HyperscanKeywordScanner:
+    """
+    KeywordScanner on a Hyperscan literal database: one SIMD pass per text,
+    and SINGLEMATCH reports each keyword at most once.
+    """
+    
+    def __init__(self, keywords):
+        self.keywords = list(dict.fromkeys(keywords))
+        self.db = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+        self.db.compile(
+            expressions=[k.encode() for k in self.keywords],
+            ids=list(range(len(self.keywords))),
+            elements=len(self.keywords),
+            flags=hyperscan.HS_FLAG_SINGLEMATCH,
+            literal=True,
+        )
+        # Scratch space can't be shared between concurrent scans
+        self._local = threading.local()
+    
+    def scan(self, body):
+        """The set of keywords found in body (case-sensitive)."""
+        scratch = getattr(self._local, 'scratch', None)
+        if scratch is None:
+            scratch = self._local.scratch = hyperscan.Scratch(self.db)
+        found = set()
+        self.db.scan(
+            body,
+            match_event_handler=lambda id_, start, end, flags, context: found.add(self.keywords[id_]),
+            scratch=scratch,
+        )
+        return found
 
 
+def keyword_scanner(keywords):
+    """The fastest available scanner: Hyperscan if installed, else regex."""
+    if hyperscan is not None:
+        return HyperscanKeywordScanner(keywords)
+    return KeywordScanner(keywords)
+
+
+# Signals too generic to count as a location hint
+GENERIC_SIGNALS = frozenset({'baltimore', 'bmore', 'charm city'})
+# Matched against lowercased text, so the signals are lowercased too
+BALTIMORE_SIGNALS_LOWER = tuple(s.lower() for s in BALTIMORE_SIGNALS)
+LOCATION_SIGNALS = keyword_scanner(s for s in BALTIMORE_SIGNALS_LOWER if s not in GENERIC_SIGNALS)
+
+# Damage indicators
+DAMAGE_WORDS = ['damage', 'damaged', 'destroyed', 'broke', 'broken', 'bent',
+                'flat tire', 'blowout', 'bent rim', 'alignment', 'suspension',
+                'repair bill', 'mechanic', 'tow truck', 'totaled']
+
+# Severity amplifiers
+SEVERE_WORDS = ['horrible', 'terrible', 'dangerous', 'hazard', 'years', 'months',
+                'again', 'still', 'never fixed', 'keeps', 'every time', 'always']
+
+# Repetition signals (chronic problem indicators) — these get extra weight
+CHRONIC_WORDS = ['years', 'every year', 'same pothole', 'same spot', 'been reported',
+                 'reported before', 'nothing done', 'ignore', 'unfixed', 'still there']
+
+# Any of these marks a post as describing a long-running problem (is_chronic_signal)
+CHRONIC_SIGNALS = frozenset({'years', 'months', 'same spot', 'again', 'still broken', 'never fixed'})
+
+
+def _intensity_weights():
+    """
+    Each word's total weight; 'years' is both a severity and a chronic signal.
+    Chronic signals that don't affect the score ('still broken') get weight 0,
+    so the same scan also answers is_chronic_signal.
+    """
+    weights = {}
+    for words, weight in ((DAMAGE_WORDS, 0.5), (SEVERE_WORDS, 0.5), (CHRONIC_WORDS, 1)):
+        for word in words:
+            weights[word] = weights.get(word, 0) + weight
+    for word in CHRONIC_SIGNALS:
+        weights.setdefault(word, 0)
+    return weights
+
+
+INTENSITY_WEIGHTS = _intensity_weights()
+INTENSITY_WORDS = keyword_scanner(INTENSITY_WEIGHTS)
+
+# Any of these (as a substring of the lowercased text) marks a post as about Baltimore
+RELEVANCE_SIGNALS = ['baltimore', 'bmore', 'charm city', 'balt', ' md ']
+# A signal containing another one can never decide the check ('baltimore'
+# always contains 'balt'), so only the minimal ones are searched for
+RELEVANCE_SIGNALS_MINIMAL = [
+    s for s in RELEVANCE_SIGNALS if not any(other != s and other in s for other in RELEVANCE_SIGNALS)
+]
+RELEVANCE_SIGNALS_BYTES = tuple(s.encode('ascii') for s in RELEVANCE_SIGNALS_MINIMAL)
+
 def get_reddit_client():
     """Initialize Reddit client from environment variables."""
     client_id = os.getenv('REDDIT_CLIENT_ID')
@@ -105,7 +284,7 @@ def get_reddit_client():
             "Get credentials at: https://www.reddit.com/prefs/apps"
         )
     
-    return praw.Reddit(
+    return asyncpraw.Reddit(
         client_id=client_id,
         client_secret=client_secret,
         user_agent=user_agent,
@@ -113,101 +292,208 @@ def get_reddit_client():
     )
 
 
-def extract_location_hints(text):
-    """Try to extract street names or neighborhood mentions from post text."""
+class TokenBucket:
+    """
+    Async token bucket: acquire() waits until a request may be sent.
+    Refills at rate_per_minute, allowing bursts of up to `burst` requests.
+    """
+    
+    def __init__(self, rate_per_minute, burst):
+        self.rate = rate_per_minute / 60
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+    
+    async def acquire(self):
+        # Waiters queue on the lock, so tokens are handed out in arrival order
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+def search_cache_path(query, time_filter, limit):
+    """Today's cache file for one search; a new day means a fresh fetch."""
+    digest = hashlib.sha1(f"{query}|{time_filter}|{limit}".encode()).hexdigest()[:16]
+    return os.path.join(CACHE_DIR, f"{date.today().isoformat()}_{digest}.json")
+
+
+def prune_search_cache():
+    """Remove cached searches from previous days."""
+    if not os.path.isdir(CACHE_DIR):
+        return
+    today = date.today().isoformat()
+    for name in os.listdir(CACHE_DIR):
+        if not name.startswith(today):
+            os.remove(os.path.join(CACHE_DIR, name))
+
+
+async def search_posts(subreddit, query, time_filter, limit, rate_limiter=None):
+    """
+    Raw results of one subreddit search, as objects with RAW_POST_FIELDS
+    attributes. Served from today's cache when present; otherwise fetched
+    (waiting on rate_limiter) and cached.
+    """
+    path = search_cache_path(query, time_filter, limit)
+    if os.path.exists(path):
+        with open(path, 'rb') as f:
+            raw = orjson.loads(f.read())
+    else:
+        if rate_limiter is not None:
+            await rate_limiter.acquire()
+        raw = [
+            {field: getattr(post, field) for field in RAW_POST_FIELDS}
+            async for post in subreddit.search(query, sort='new', time_filter=time_filter, limit=limit)
+        ]
+        # Write then rename, so an interrupted run never leaves a partial entry
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(path + '.tmp', 'wb') as f:
+            f.write(orjson.dumps(raw))
+        os.replace(path + '.tmp', path)
+    return [SimpleNamespace(**post) for post in raw]
+
+
+def lower_bytes(text):
+    """
+    The lowercased text as UTF-8 bytes, which every keyword check searches.
+    The keywords are ASCII, and an ASCII byte never occurs inside a
+    multi-byte UTF-8 sequence, so a byte match is exactly a str match.
+    """
+    return text.lower().encode('utf-8', 'replace')
+
+
+def extract_location_hints(text, body=None):
+    """
+    Try to extract street names or neighborhood mentions from post text.
+    Pass body if the caller already has lower_bytes(text).
+    """
+    if body is None:
+        body = lower_bytes(text)
     locations = []
     
     for pattern in STREET_PATTERNS:
-        matches = re.findall(pattern, text, re.IGNORECASE)
-        locations.extend(matches)
+        locations.extend(pattern.findall(text))
     
     # Also check for neighborhood name mentions
-    text_lower = text.lower()
-    for signal in BALTIMORE_SIGNALS:
-        if signal in text_lower and signal not in ['baltimore', 'bmore', 'charm city']:
-            locations.append(signal)
+    locations.extend(LOCATION_SIGNALS.scan(body))
     
-    return list(set(locations))
+    return set(locations)
 
 
-def score_damage_intensity(text):
+def score_damage_intensity(text, body=None):
     """
     Simple heuristic scoring for how severe the described problem seems.
-    Returns 1-5.
+    Returns (score 1-5, whether the text has a chronic signal).
     
     This is intentionally naive — a starting point for refinement.
     """
-    text_lower = text.lower()
-    score = 1
-    
-    # Damage indicators
-    damage_words = ['damage', 'damaged', 'destroyed', 'broke', 'broken', 'bent', 
-                    'flat tire', 'blowout', 'bent rim', 'alignment', 'suspension',
-                    'repair bill', 'mechanic', 'tow truck', 'totaled']
-    
-    # Severity amplifiers  
-    severe_words = ['horrible', 'terrible', 'dangerous', 'hazard', 'years', 'months',
-                    'again', 'still', 'never fixed', 'keeps', 'every time', 'always']
+    if body is None:
+        body = lower_bytes(text)
+    found = INTENSITY_WORDS.scan(body)
+    score = 1 + sum(INTENSITY_WEIGHTS[word] for word in found)
+    return min(round(score), 5), not CHRONIC_SIGNALS.isdisjoint(found)
+
+
+def might_be_baltimore_relevant(text):
+    """
+    Cheap screen run before is_baltimore_relevant: bytes.find over an ASCII
+    copy of the text, with no str lowercasing or regex. Dropping non-ASCII
+    characters can create a false hit but never hides a signal, so a False
+    here is final and a True still needs the exact check — unless the text
+    is pure ASCII, where nothing was dropped and the answer is already exact.
+    """
+    body = text.encode('ascii', 'ignore').lower()
+    return any(body.find(signal) >= 0 for signal in RELEVANCE_SIGNALS_BYTES)
+
+
+def is_baltimore_relevant(text, body=None):
+    """Quick check that a post is actually about Baltimore."""
+    if body is None:
+        body = lower_bytes(text)
+    return any(signal in body for signal in RELEVANCE_SIGNALS_BYTES)
+
+
+def process_post(title, selftext):
+    """
+    The text-derived fields for one post: None if it isn't about Baltimore,
+    else (location_hints, hint count, intensity score, chronic flag).
+    The hints are stored sorted and '|'-joined (no hint contains a '|').
     
-    # Repetition signals (chronic problem indicators)
-    chronic_words = ['years', 'every year', 'same pothole', 'same spot', 'been reported',
-                     'reported before', 'nothing done', 'ignore', 'unfixed', 'still there']
+    Pure and module-level, so it can run in a worker process.
+    """
+    full_text = f"{title} {selftext}"
+    if not might_be_baltimore_relevant(full_text):
+        return None
     
-    for word in damage_words:
-        if word in text_lower:
-            score += 0.5
+    # Lowercased and encoded once, and shared by every keyword check below
+    body = lower_bytes(full_text)
     
-    for word in severe_words:
-        if word in text_lower:
-            score += 0.5
-            
-    for word in chronic_words:
-        if word in text_lower:
-            score += 1  # chronic signals get extra weight
+    if not full_text.isascii() and not is_baltimore_relevant(full_text, body):
+        return None
     
-    return min(round(score), 5)
+    location_hints = extract_location_hints(full_text, body)
+    intensity, is_chronic = score_damage_intensity(full_text, body)
+    return '|'.join(sorted(location_hints)), len(location_hints), intensity, is_chronic
 
 
-def is_baltimore_relevant(text):
-    """Quick check that a post is actually about Baltimore."""
-    text_lower = text.lower()
-    return any(signal in text_lower for signal in ['baltimore', 'bmore', 'charm city', 'balt', ' md '])
-
-
-def fetch_posts_for_query(reddit, subreddit, query, category, limit=100):
-    """Fetch posts matching a search query."""
-    posts = []
+async def fetch_posts_for_query(subreddit, query, category, limit=100, rate_limiter=None,
+                                processed=None, process_pool=None):
+    """
+    Fetch posts matching a search query, as a dict of POST_COLUMNS lists.
+    
+    `processed` maps post id -> process_post() result and is shared by all
+    searches: overlapping queries return many of the same posts, and each is
+    only scanned and scored the first time it's seen. New posts are scored
+    in `process_pool` when given, off the event loop and the GIL.
+    """
+    posts = {col: [] for col in POST_COLUMNS}
+    columns = [posts[col] for col in POST_COLUMNS]
+    if processed is None:
+        processed = {}
     
     try:
-        results = subreddit.search(query, sort='new', time_filter='year', limit=limit)
+        results = await search_posts(subreddit, query, 'year', limit, rate_limiter)
+        
+        new_posts = list({post.id: post for post in results if post.id not in processed}.values())
+        titles = [post.title for post in new_posts]
+        selftexts = [post.selftext for post in new_posts]
+        if process_pool is not None:
+            # Collecting the pool's results blocks, so do that on a helper thread
+            derived = await asyncio.to_thread(
+                list, process_pool.map(process_post, titles, selftexts, chunksize=PROCESS_CHUNK_SIZE)
+            )
+        else:
+            derived = map(process_post, titles, selftexts)
+        for post, fields in zip(new_posts, derived):
+            processed[post.id] = fields
         
         for post in results:
-            full_text = f"{post.title} {post.selftext}"
-            
-            if not is_baltimore_relevant(full_text):
+            derived = processed[post.id]
+            if derived is None:
                 continue
             
-            location_hints = extract_location_hints(full_text)
-            intensity = score_damage_intensity(full_text)
-            
-            posts.append({
-                'post_id': post.id,
-                'category': category,
-                'search_query': query,
-                'title': post.title,
-                'text': post.selftext[:1000],  # truncate long posts
-                'url': f"https://reddit.com{post.permalink}",
-                'score': post.score,
-                'num_comments': post.num_comments,
-                'created_utc': datetime.utcfromtimestamp(post.created_utc),
-                'location_hints': json.dumps(location_hints),
-                'location_hint_count': len(location_hints),
-                'damage_intensity_score': intensity,
-                'is_chronic_signal': any(
-                    w in full_text.lower() 
-                    for w in ['years', 'months', 'same spot', 'again', 'still broken', 'never fixed']
-                )
-            })
+            # Build the whole row before appending, so a bad post can't
+            # leave the column lists with different lengths
+            row = (
+                post.id,
+                category,
+                query,
+                post.title,
+                post.selftext[:1000],  # truncate long posts
+                f"https://reddit.com{post.permalink}",
+                post.score,
+                post.num_comments,
+                int(post.created_utc),  # epoch seconds; analyze.py converts the column
+                *derived,
+            )
+            for values, value in zip(columns, row):
+                values.append(value)
     
     except Exception as e:
         print(f"  Warning: Error fetching '{query}': {e}")
@@ -215,8 +501,9 @@ def fetch_posts_for_query(reddit, subreddit, query, category, limit=100):
     return posts
 
 
-def main():
+async def main():
     os.makedirs(os.path.dirname(OUTPUT_PATH), exist_ok=True)
+    prune_search_cache()
     
     try:
         reddit = get_reddit_client()
@@ -224,41 +511,76 @@ def main():
         print(f"Error: {e}")
         return
     
-    subreddit = reddit.subreddit('baltimore')
-    all_posts = []
+    all_queries = [(category, query) for category, queries in SEARCH_QUERIES.items() for query in queries]
+    rate_limiter = TokenBucket(REQUESTS_PER_MINUTE, burst=MAX_CONCURRENT_SEARCHES)
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_SEARCHES)
+    # Only touched from the event loop thread, so it needs no lock
+    processed = {}
     
-    print("Fetching r/baltimore posts...\n")
+    async def search(category, query):
+        async with semaphore:
+            return await fetch_posts_for_query(subreddit, query, category, rate_limiter=rate_limiter,
+                                               processed=processed, process_pool=process_pool)
     
-    for category, queries in SEARCH_QUERIES.items():
-        print(f"Category: {category}")
-        for query in tqdm(queries, desc=f"  searching", leave=False):
-            posts = fetch_posts_for_query(reddit, subreddit, query, category)
-            all_posts.extend(posts)
+    print(f"Fetching r/baltimore posts ({len(all_queries)} searches)...\n")
     
-    if not all_posts:
-        print("No posts fetched.")
-        return
+    # Rows go to the CSV as each search's results come in; only the post ids
+    # and a few counters for the summary are kept in memory. They're written
+    # to a .tmp file that replaces OUTPUT_PATH only once every search is done,
+    # so a failed run leaves the previous CSV intact.
+    tmp_path = OUTPUT_PATH + '.tmp'
+    seen = set()
+    by_category = Counter()
+    with_hints = chronic = high_intensity = 0
     
-    df = pd.DataFrame(all_posts)
+    async with reddit:
+        subreddit = await reddit.subreddit('baltimore')
+        
+        with pa_csv.CSVWriter(tmp_path, POST_SCHEMA) as writer, \
+                ProcessPoolExecutor(max_workers=PROCESS_WORKERS, mp_context=PROCESS_CONTEXT) as process_pool:
+            tasks = [asyncio.create_task(search(category, query)) for category, query in all_queries]
+            # Written in query order (not completion order) so the dedupe keeps
+            # the same copy of a post on every run
+            for task in tqdm(tasks, desc="  searching", leave=False):
+                posts = await task
+                keep = []
+                for i, post_id in enumerate(posts['post_id']):
+                    # Same post might match multiple queries
+                    if post_id in seen:
+                        continue
+                    seen.add(post_id)
+                    keep.append(i)
+                    
+                    by_category[posts['category'][i]] += 1
+                    with_hints += posts['location_hint_count'][i] > 0
+                    chronic += posts['is_chronic_signal'][i]
+                    high_intensity += posts['damage_intensity_score'][i] >= 4
+                
+                # One record batch per search, formatted by Arrow's C++ writer
+                writer.write_batch(pa.record_batch(
+                    [pa.array([posts[field.name][i] for i in keep], field.type) for field in POST_SCHEMA],
+                    schema=POST_SCHEMA,
+                ))
     
-    # Deduplicate (same post might match multiple queries)
-    df = df.drop_duplicates(subset='post_id')
+    if not seen:
+        os.remove(tmp_path)
+        print("No posts fetched.")
+        return
+    os.replace(tmp_path, OUTPUT_PATH)
     
     print(f"\n{'='*50}")
     print(f"REDDIT FETCH COMPLETE")
     print(f"{'='*50}")
-    print(f"Total unique posts: {len(df):,}")
+    print(f"Total unique posts: {len(seen):,}")
     print(f"\nBy category:")
-    for cat, count in df['category'].value_counts().items():
+    for cat, count in by_category.most_common():
         print(f"  {cat:<20} {count:>5,}")
-    print(f"\nWith location hints: {(df['location_hint_count'] > 0).sum():,}")
-    print(f"Chronic signals: {df['is_chronic_signal'].sum():,}")
-    print(f"High intensity (4-5): {(df['damage_intensity_score'] >= 4).sum():,}")
+    print(f"\nWith location hints: {with_hints:,}")
+    print(f"Chronic signals: {chronic:,}")
+    print(f"High intensity (4-5): {high_intensity:,}")
     print(f"{'='*50}\n")
     
-    df.to_csv(OUTPUT_PATH, index=False)
     print(f"Saved to: {OUTPUT_PATH}")
 
-
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
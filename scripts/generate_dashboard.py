@@ -8,171 +8,48 @@ Output: output/dashboard.html — open in any browser, no server needed.
 """
 
 import os
+import re
 import json
+import base64
+import heapq
+import gzip
+import io
+import orjson
+import numpy as np
+import pandas as pd
 import folium
-from folium.plugins import MarkerCluster, HeatMap
 from datetime import datetime
 
+from categories import categorize_type
+
+try:
+    import ijson  # streams the hotspots out of large analysis results
+except ImportError:
+    ijson = None
+
+try:
+    import rjsmin  # minifies the inlined client scripts
+except ImportError:
+    rjsmin = None
+
 DATA_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'analysis_results.json')
 OUTPUT_DIR = os.path.join(os.path.dirname(__file__), '..', 'output')
 OUTPUT_PATH = os.path.join(OUTPUT_DIR, 'dashboard.html')
+# Precompressed copy for static hosts that serve .gz files directly
+OUTPUT_GZ_PATH = OUTPUT_PATH + '.gz'
 
 # Baltimore city center
 BALT_CENTER = [39.2904, -76.6122]
 DEFAULT_ZOOM = 12
 
-# Color scale for chronic severity
-def severity_color(score):
-    if score >= 30:
-        return '#c0392b'  # deep red — very high
-    elif score >= 20:
-        return '#e74c3c'  # red
-    elif score >= 12:
-        return '#e67e22'  # orange
-    elif score >= 6:
-        return '#f39c12'  # amber
-    else:
-        return '#f1c40f'  # yellow
-
-
-def severity_label(score):
-    if score >= 30:
-        return 'Critical'
-    elif score >= 20:
-        return 'High'
-    elif score >= 12:
-        return 'Elevated'
-    elif score >= 6:
-        return 'Moderate'
-    else:
-        return 'Low'
-
-
-def make_hotspot_popup(hotspot):
-    """Build HTML popup content for a hotspot marker."""
-    addr = hotspot.get('address_hint') or 'Location'
-    neighborhood = hotspot.get('neighborhood', 'Unknown')
-    report_count = hotspot.get('report_count', 0)
-    span_days = hotspot.get('span_days', 0)
-    primary_type = hotspot.get('primary_type', 'Unknown')
-    severity = hotspot.get('severity_score', 0)
-    failed_fixes = hotspot.get('possible_failed_fixes', 0)
-    first_report = hotspot.get('first_report', '')[:10]
-    last_report = hotspot.get('last_report', '')[:10]
-    avg_res = hotspot.get('avg_resolution_days')
-    is_high = hotspot.get('is_high_priority', False)
-    history = hotspot.get('history', [])
-    cluster_id = hotspot.get('cluster_id', 0)
-
-    status_html = ''
-    for status, count in hotspot.get('status_breakdown', {}).items():
-        status_html += f'<div class="status-row"><span>{status}</span><span>{count}</span></div>'
-
-    failed_fix_html = ''
-    if failed_fixes > 0:
-        failed_fix_html = f'''
-        <div class="failed-fix-warning">
-            ⚠️ {failed_fixes} possible failed fix{"es" if failed_fixes > 1 else ""}
-            <span class="failed-fix-note">Re-reported within 120 days of closure</span>
-        </div>'''
-
-    priority_badge = '<span class="priority-badge">HIGH PRIORITY</span>' if is_high else ''
-
-    # Build history timeline rows
-    history_rows = ''
-    for entry in history:
-        date = entry.get('date') or '—'
-        status = entry.get('status') or '—'
-        res = entry.get('resolution_days')
-        is_rereport = entry.get('is_rereport', False)
-
-        row_class = 'hist-rereport' if is_rereport else 'hist-normal'
-        rereport_badge = '<span class="rereport-badge">↩ re-report</span>' if is_rereport else ''
-        res_str = f'{res}d' if res is not None else '—'
-
-        status_class = ''
-        if 'closed' in status.lower() and 'duplicate' not in status.lower():
-            status_class = 'hist-status-closed'
-        elif 'open' in status.lower() or 'new' in status.lower():
-            status_class = 'hist-status-open'
-
-        history_rows += f'''<tr class="{row_class}">
-            <td class="hist-date">{date}</td>
-            <td class="hist-status {status_class}">{status} {rereport_badge}</td>
-            <td class="hist-res">{res_str}</td>
-        </tr>'''
-
-    return f"""
-    <div class="popup-card">
-        <div class="popup-header">
-            <div class="popup-title">{addr}</div>
-            <div class="popup-neighborhood">{neighborhood} {priority_badge}</div>
-        </div>
-        <div class="popup-type">{primary_type}</div>
-        {failed_fix_html}
-        <div class="popup-stats">
-            <div class="stat-box">
-                <div class="stat-num">{report_count}</div>
-                <div class="stat-label">total reports</div>
-            </div>
-            <div class="stat-box">
-                <div class="stat-num">{span_days}</div>
-                <div class="stat-label">days active</div>
-            </div>
-            <div class="stat-box">
-                <div class="stat-num">{round(severity, 1)}</div>
-                <div class="stat-label">severity score</div>
-            </div>
-        </div>
-        <div class="popup-timeline-range">
-            <span>First: {first_report}</span>
-            <span>→</span>
-            <span>Last: {last_report}</span>
-        </div>
-        {f'<div class="popup-resolution">Median resolution: {round(avg_res)} days</div>' if avg_res and avg_res == avg_res else ''}
-        <div class="status-breakdown">
-            <div class="status-heading">Status breakdown</div>
-            {status_html}
-        </div>
-        <div class="history-section">
-            <button class="history-toggle" onclick="toggleHistory('hist-{cluster_id}', this)">
-                ▶ Show full history ({report_count} reports)
-            </button>
-            <div id="hist-{cluster_id}" class="history-table-wrap" style="display:none">
-                <table class="history-table">
-                    <thead><tr>
-                        <th>Date</th><th>Status</th><th>Resolved</th>
-                    </tr></thead>
-                    <tbody>{history_rows}</tbody>
-                </table>
-            </div>
-        </div>
-    </div>
-    """
-
 
-def categorize_type(srtype):
-    """Map a raw srtype string to a broad filter category."""
-    if not srtype:
-        return 'Other'
-    t = str(srtype).lower()
-    if 'pothole' in t:
-        return 'Pothole'
-    if 'light' in t or 'streetlight' in t:
-        return 'Street Light'
-    if 'alley' in t:
-        return 'Alley'
-    if 'sidewalk' in t:
-        return 'Sidewalk'
-    if 'water' in t or 'main' in t:
-        return 'Water Main'
-    if 'cave' in t or 'sinkhole' in t:
-        return 'Cave-In / Sinkhole'
-    if 'storm' in t or 'drain' in t or 'catch' in t:
-        return 'Storm Drain'
-    if 'curb' in t or 'bridge' in t or 'street' in t:
-        return 'Street / Curb'
-    return 'Other'
+def categorize_types(srtypes):
+    """Map a Series of raw srtype strings to broad filter categories (categorical)."""
+    # There are only a few distinct srtypes, so each is categorized once
+    codes, uniques = pd.factorize(srtypes)
+    cats = np.array([categorize_type(t) for t in uniques] + ['Other'], dtype=object)
+    # NaN gets code -1, which picks the trailing 'Other'
+    return pd.Series(pd.Categorical(cats[codes], categories=list(CATEGORY_COLORS)), index=srtypes.index)
 
 
 # Category → color for filter chips and markers
@@ -189,202 +66,236 @@ CATEGORY_COLORS = {
 }
 
 
-def build_map(data):
-    """Build the Folium map — markers are driven by embedded JS data for live filtering."""
+# Base heatmap: the top HEAT_POINTS hotspots, weighted by severity capped at HEAT_MAX_WEIGHT
+HEAT_POINTS = 200
+HEAT_MAX_WEIGHT = 50
+HEAT_OPTIONS = {
+    'minOpacity': 0.2,
+    'maxZoom': 16,
+    'radius': 30,
+    'blur': 25,
+    'gradient': {0.2: '#3498db', 0.5: '#f39c12', 0.8: '#e74c3c', 1.0: '#c0392b'},
+}
+# The Leaflet.heat build folium's HeatMap plugin loads
+LEAFLET_HEAT_JS = 'https://cdn.jsdelivr.net/gh/python-visualization/folium@main/folium/templates/leaflet_heat.min.js'
+# Point clustering for the hotspot markers
+SUPERCLUSTER_JS = 'https://unpkg.com/supercluster@8.0.1/dist/supercluster.min.js'
+
+# Bits of the per-hotspot 'flags' byte in the embedded map data; the
+# category index fills the bits from FLAG_CATEGORY_SHIFT up
+FLAG_HIGH_PRIORITY = 1
+FLAG_FAILED_FIXES = 2
+FLAG_CATEGORY_SHIFT = 2
+
+# Hotspot fields the map and sidebar read
+HOTSPOT_COLUMNS = [
+    'cluster_id', 'latitude', 'longitude', 'primary_type', 'severity_score',
+    'address_hint', 'neighborhood', 'report_count', 'possible_failed_fixes',
+    'is_high_priority', 'span_days', 'first_report', 'last_report',
+    'avg_resolution_days', 'status_breakdown', 'history',
+]
+
+
+# Top-level results the sidebar reads besides the hotspots
+RESULT_KEYS = ('summary', 'neighborhoods', 'gaps', 'category_stats')
+
+
+# Errors raised on malformed (or NaN-holding) JSON by whichever parser is used
+PARSE_ERRORS = (ValueError,) if ijson is None else (ValueError, ijson.JSONError)
+
+
+def load_results(path):
+    """
+    Read the analysis results. Files written by older versions of
+    analyze.py can hold bare NaN tokens, which neither ijson nor orjson
+    accept; those are read again with the standard json module.
+    """
+    try:
+        if ijson is not None:
+            return stream_results(path)
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    except PARSE_ERRORS:
+        with open(path, 'rb') as f:
+            return json.load(f)
+
+
+def stream_results(path):
+    """
+    Parse the analysis results in one streaming ijson pass, trimming each
+    hotspot to HOTSPOT_COLUMNS as it is read, so the raw file and the full
+    document are never in memory.
+    """
+    data = {'hotspots': []}
+    builder = start = None
+    with open(path, 'rb') as f:
+        for prefix, event, value in ijson.parse(f, use_float=True):
+            if builder is None:
+                if prefix != 'hotspots.item' and prefix not in RESULT_KEYS:
+                    continue
+                if event not in ('start_map', 'start_array'):
+                    data[prefix] = value
+                    continue
+                builder, start = ijson.ObjectBuilder(), prefix
+            builder.event(event, value)
+            # A container ends with the same prefix it started with
+            if prefix == start and event in ('end_map', 'end_array'):
+                if start == 'hotspots.item':
+                    h = builder.value
+                    data['hotspots'].append({k: h[k] for k in HOTSPOT_COLUMNS if k in h})
+                else:
+                    data[start] = builder.value
+                builder = None
+    return data
+
+
+def hotspot_frame(hotspots):
+    """
+    The hotspots as a DataFrame (index = position in the list), with the
+    filter category ('cat') and whether it has coordinates to map ('mapped').
+    """
+    df = pd.DataFrame(hotspots, columns=HOTSPOT_COLUMNS).astype(
+        {'latitude': float, 'longitude': float, 'severity_score': float})
+    df['cat'] = categorize_types(df['primary_type'])
+    # Missing and zero coordinates both mean unmapped
+    df['mapped'] = df['latitude'].fillna(0).ne(0) & df['longitude'].fillna(0).ne(0)
+    return df
+
 
-    m = folium.Map(
+def history_rows(history):
+    """A hotspot's history as compact [date, status, resolution_days, is_rereport] rows."""
+    return [
+        [e.get('date'), e.get('status'), e.get('resolution_days'), int(bool(e.get('is_rereport')))]
+        for e in history
+    ]
+
+
+def status_rows(breakdown):
+    """A hotspot's status breakdown as [status, count] rows, most common first."""
+    return sorted(breakdown.items(), key=lambda kv: -kv[1])
+
+
+def script_json(obj, option=None):
+    """
+    obj as JSON to inline in a <script type="application/json"> tag, which
+    the page reads with JSON.parse. '</' is escaped so a value can't close
+    the tag early.
+    """
+    return orjson.dumps(obj, option=option).decode().replace('</', '<\\/')
+
+
+def build_map():
+    """
+    Build the Folium base map. Markers are driven by the data write_map_data
+    embeds, for live filtering.
+    """
+    return folium.Map(
         location=BALT_CENTER,
         zoom_start=DEFAULT_ZOOM,
         tiles='CartoDB dark_matter',
         prefer_canvas=True
     )
 
-    hotspots = data.get('hotspots', [])
 
+def write_map_data(df, out):
+    """
+    Write the embedded map data and the client-side map libraries to out.
+    df is the hotspot_frame.
+    """
     # Embed all hotspot data as a JS variable so the filter can work client-side.
-    # We build a compact array: [lat, lon, category, severity, address, neighborhood,
-    #                             report_count, failed_fixes, is_high, popup_html]
-    hotspot_js_data = []
-    for h in hotspots:
-        lat = h.get('latitude')
-        lon = h.get('longitude')
-        if not lat or not lon:
-            continue
-        cat = categorize_type(h.get('primary_type', ''))
-        popup_html = make_hotspot_popup(h).replace('`', "'").replace('\n', ' ')
-        hotspot_js_data.append({
-            'lat': lat, 'lon': lon,
-            'cat': cat,
-            'score': h.get('severity_score', 0),
-            'addr': h.get('address_hint') or 'Unknown',
-            'hood': h.get('neighborhood', ''),
-            'count': h.get('report_count', 0),
-            'failed': h.get('possible_failed_fixes', 0),
-            'high': h.get('is_high_priority', False),
-            'popup': popup_html,
-        })
+    # It's column-wise (one array per field, no repeated keys). The
+    # high-priority and failed-fix booleans and the category (an index into
+    # 'cats') are packed into one 'flags' byte per hotspot, shipped as a
+    # base64 string. Popups are rendered from these fields in the browser
+    # when opened, so no popup HTML is embedded
+    mapped = df[df['mapped']]
+    avg_res = mapped['avg_resolution_days']
+    flags = (
+        mapped['is_high_priority'].fillna(False).to_numpy(bool) * FLAG_HIGH_PRIORITY
+        | (mapped['possible_failed_fixes'].fillna(0).to_numpy() > 0) * FLAG_FAILED_FIXES
+        | mapped['cat'].cat.codes.to_numpy(np.uint8) << FLAG_CATEGORY_SHIFT
+    ).astype(np.uint8)
+    hotspot_js_data = {
+        'lat': mapped['latitude'].tolist(),
+        'lon': mapped['longitude'].tolist(),
+        'cats': list(mapped['cat'].cat.categories),
+        'score': mapped['severity_score'].tolist(),
+        'addr': mapped['address_hint'].fillna('').tolist(),
+        'count': mapped['report_count'].tolist(),
+        'flags': base64.b64encode(flags.tobytes()).decode('ascii'),
+        # Popup-only fields
+        'id': mapped['cluster_id'].tolist(),
+        'hood': mapped['neighborhood'].fillna('Unknown').tolist(),
+        'type': mapped['primary_type'].fillna('Unknown').tolist(),
+        'failed': mapped['possible_failed_fixes'].fillna(0).astype(int).tolist(),
+        'span': mapped['span_days'].tolist(),
+        'first': mapped['first_report'].fillna('').str[:10].tolist(),
+        'last': mapped['last_report'].fillna('').str[:10].tolist(),
+        # Missing, zero or NaN medians aren't shown
+        'res': [round(r) if r and r == r else None for r in avg_res],
+        'status': [status_rows(s) if isinstance(s, dict) else [] for s in mapped['status_breakdown']],
+        'history': [history_rows(h) if isinstance(h, list) else [] for h in mapped['history']],
+    }
 
     # Inject the data + rendering engine as a custom JS element
-    hotspot_json = json.dumps(hotspot_js_data)
-    category_colors_json = json.dumps(CATEGORY_COLORS)
-
-    js_engine = f"""
-    <script id="hotspot-data" type="application/json">{hotspot_json}</script>
-    <script id="category-colors" type="application/json">{category_colors_json}</script>
+    # Gzipped (mtime 0, so rebuilds are byte-identical) and base64-encoded;
+    # the page inflates it with DecompressionStream
+    hotspot_b64 = base64.b64encode(gzip.compress(orjson.dumps(hotspot_js_data), 9, mtime=0)).decode('ascii')
+    # A small constant, so it's a JS literal rather than JSON to parse
+    category_colors_js = script_json(CATEGORY_COLORS)
+    # The gradient's stops are float keys
+    heat_config_json = script_json({
+        'points': HEAT_POINTS, 'max_weight': HEAT_MAX_WEIGHT, 'options': HEAT_OPTIONS,
+    }, option=orjson.OPT_NON_STR_KEYS)
+
+    # The heatmap and the marker clusters are built client-side from
+    # hotspot-data, so only their libraries are loaded here (after
+    # leaflet.js, from the header)
+    out.write(f"""
+    <script id="hotspot-data" type="application/gzip">{hotspot_b64}</script>
+    <script>var CATEGORY_COLORS = {category_colors_js};</script>
+    <script id="heat-config" type="application/json">{heat_config_json}</script>
+    <script src="{LEAFLET_HEAT_JS}"></script>
+    <script src="{SUPERCLUSTER_JS}"></script>
+    """)
+
+
+def sidebar_data(data):
+    """
+    The neighborhood, category and gap rows the sidebar shows, as compact
+    lists for renderSidebar. The hotspot list and filter chips are built in
+    the browser from hotspot-data.
     """
-    m.get_root().html.add_child(folium.Element(js_engine))
-
-    # Add a thin base heatmap using just the top 200 hotspots (perf)
-    if hotspots:
-        heat_data = [
-            [h['latitude'], h['longitude'], min(h['severity_score'], 50)]
-            for h in hotspots[:200]
-            if h.get('latitude') and h.get('longitude')
-        ]
-        HeatMap(
-            heat_data,
-            name='Severity Heatmap',
-            min_opacity=0.2,
-            max_zoom=16,
-            radius=30,
-            blur=25,
-            gradient={0.2: '#3498db', 0.5: '#f39c12', 0.8: '#e74c3c', 1.0: '#c0392b'}
-        ).add_to(m)
-
-    return m
-
-
-def build_sidebar_html(data):
-    """Generate the sidebar stats panel HTML."""
-    summary = data.get('summary', {})
-    hotspots = data.get('hotspots', [])
-    gaps = data.get('gaps', [])
     neighborhoods = data.get('neighborhoods', {})
+    cat_stats = data.get('category_stats', {})
 
-    # Build filter chips from actual categories present in data
-    cats_present = {}
-    for h in hotspots:
-        cat = categorize_type(h.get('primary_type', ''))
-        cats_present[cat] = cats_present.get(cat, 0) + 1
-
-    filter_chips = ''
-    for cat, cnt in sorted(cats_present.items(), key=lambda x: -x[1]):
-        color = CATEGORY_COLORS.get(cat, '#7f8c8d')
-        filter_chips += f'''
-        <div class="filter-chip" data-cat="{cat}"
-             style="--chip-color:{color}"
-             onclick="toggleFilter(\'{cat}\')">
-            <div class="chip-dot"></div>{cat} <span style="opacity:.5;font-size:10px">({cnt})</span>
-        </div>'''
-
-    filter_section = f'''
-    <div class="filter-section">
-        <div class="filter-title">Filter by Type</div>
-        <div class="filter-chips">
-            {filter_chips}
-            <div class="filter-chip failed-fix-chip" id="failed-fixes-toggle"
-                 style="--chip-color:#e74c3c"
-                 onclick="toggleFailedFixes()">
-                <div class="chip-dot"></div>⚠️ Failed fixes only
-            </div>
-        </div>
-        <button id="clear-filters" onclick="clearFilters()">Clear filters</button>
-    </div>
-    '''
-
-    # Top hotspots for sidebar list
-    top_hotspots = sorted(hotspots, key=lambda x: x.get('severity_score', 0), reverse=True)[:8]
-
-    hotspot_rows = ''
-    for h in top_hotspots:
-        color = severity_color(h.get('severity_score', 0))
-        label = severity_label(h.get('severity_score', 0))
-        addr = h.get('address_hint') or 'Unknown location'
-        hood = h.get('neighborhood', '')
-        count = h.get('report_count', 0)
-        failed = h.get('possible_failed_fixes', 0)
-        cat = categorize_type(h.get('primary_type', ''))
-        cat_color = CATEGORY_COLORS.get(cat, color)
-        failed_html = f'<span class="failed-tag">⚠️ {failed} failed fix{"es" if failed > 1 else ""}</span>' if failed else ''
-
-        hotspot_rows += f"""
-        <div class="hotspot-row" data-cat="{cat}" data-failed="{failed}" onclick="focusHotspot({h['latitude']}, {h['longitude']})">
-            <div class="hotspot-dot" style="background:{cat_color}"></div>
-            <div class="hotspot-info">
-                <div class="hotspot-addr">{addr[:35]}{'...' if len(addr) > 35 else ''}</div>
-                <div class="hotspot-meta">{hood} · {count} reports · <span class="severity-tag" style="color:{color}">{label}</span> {failed_html}</div>
-            </div>
-        </div>"""
-    
     # Top neighborhoods by volume
-    top_neighborhoods = sorted(
-        [(k, v) for k, v in neighborhoods.items() if v.get('total_reports', 0) > 0],
+    top_neighborhoods = heapq.nlargest(
+        8,
+        ((k, v) for k, v in neighborhoods.items() if v.get('total_reports', 0) > 0),
         key=lambda x: x[1].get('total_reports', 0),
-        reverse=True
-    )[:8]
-    
-    max_reports = top_neighborhoods[0][1]['total_reports'] if top_neighborhoods else 1
-    
-    neighborhood_rows = ''
-    for name, stats in top_neighborhoods:
-        pct = stats['total_reports'] / max_reports * 100
-        trend = stats.get('trend_pct')
-        trend_html = ''
-        if trend is not None:
-            arrow = '↑' if trend > 5 else '↓' if trend < -5 else '→'
-            color = '#e74c3c' if trend > 10 else '#2ecc71' if trend < -10 else '#95a5a6'
-            trend_html = f'<span style="color:{color};font-size:11px">{arrow} {abs(round(trend))}%</span>'
-        
-        neighborhood_rows += f"""
-        <div class="nbhd-row">
-            <div class="nbhd-name">{name[:22]}{'...' if len(name) > 22 else ''} {trend_html}</div>
-            <div class="nbhd-bar-wrap">
-                <div class="nbhd-bar" style="width:{pct}%"></div>
-            </div>
-            <div class="nbhd-count">{stats['total_reports']}</div>
-        </div>"""
-    
-    # Gap neighborhoods
-    gap_rows = ''
-    for gap in gaps[:5]:
-        gap_rows += f"""
-        <div class="gap-row">
-            <div class="gap-name">{gap['neighborhood']}</div>
-            <div class="gap-meta">Reddit signal: {gap['reddit_signal']} · 311 reports: {gap['311_reports']}</div>
-        </div>"""
-
-    if not gap_rows:
-        gap_rows = '<div class="no-data">Run fetch_reddit.py to enable gap analysis</div>'
-
-    # Category recurrence rate rows
-    cat_stats = data.get('category_stats', {})
-    cat_rows = ''
-    for cat, s in cat_stats.items():
-        total = s.get('total_requests', 0)
-        rereports = s.get('rereports', 0)
-        pct = s.get('recurrence_pct', 0)
-        color = CATEGORY_COLORS.get(cat, '#7f8c8d')
-
-        # Bar fill: scale 0-100% but visually cap at 80 so even high values fit
-        bar_pct = min(pct, 100)
-        # Color the bar red if high recurrence, amber if medium, green if low
-        bar_color = '#e74c3c' if pct >= 40 else '#e67e22' if pct >= 20 else '#2ecc71'
-
-        cat_rows += f"""
-        <div class="cat-row">
-            <div class="cat-header">
-                <div class="cat-dot" style="background:{color}"></div>
-                <div class="cat-name">{cat}</div>
-                <div class="cat-pct" style="color:{bar_color}">{pct}%</div>
-            </div>
-            <div class="cat-bar-wrap">
-                <div class="cat-bar" style="width:{bar_pct}%;background:{bar_color}"></div>
-            </div>
-            <div class="cat-detail">{total:,} requests · {rereports:,} apparent re-reports</div>
-        </div>"""
-    if not cat_rows:
-        cat_rows = '<div class="no-data">Re-run analyze.py to generate category stats</div>'
-    
+    )
+
+    return {
+        # [name, total_reports, trend_pct]
+        'neighborhoods': [[name, s['total_reports'], s.get('trend_pct')] for name, s in top_neighborhoods],
+        # [category, recurrence_pct, total_requests, rereports]
+        'categories': [
+            [cat, s.get('recurrence_pct', 0), s.get('total_requests', 0), s.get('rereports', 0)]
+            for cat, s in cat_stats.items()
+        ],
+        # [neighborhood, reddit_signal, 311_reports]
+        'gaps': [[g['neighborhood'], g['reddit_signal'], g['311_reports']] for g in data.get('gaps', [])[:5]],
+    }
+
+
+def write_sidebar_html(data, out):
+    """
+    Write the sidebar stats panel HTML to out. This is only the static
+    shell; renderSidebar fills in the lists client-side.
+    """
+    summary = data.get('summary', {})
+
     date_range = ''
     if 'date_range' in summary:
         start = summary['date_range'].get('start', '')[:10]
@@ -392,16 +303,34 @@ def build_sidebar_html(data):
         date_range = f'{start} → {end}'
     
     generated = summary.get('generated_at', '')[:16].replace('T', ' ')
+
+    sidebar_json = script_json(sidebar_data(data))
     
-    return f"""
+    out.write(f"""
+    <script id="sidebar-data" type="application/json">{sidebar_json}</script>
     <div id="sidebar">
         <div class="sidebar-header">
             <div class="sidebar-title">Baltimore 311</div>
             <div class="sidebar-subtitle">Infrastructure Intelligence</div>
             <div class="sidebar-meta">{date_range}</div>
         </div>
-        
-        {filter_section}
+        """)
+
+    # Category chips go in ahead of the failed-fixes toggle
+    out.write('''
+    <div class="filter-section">
+        <div class="filter-title">Filter by Type</div>
+        <div class="filter-chips" id="filter-chips">
+            <div class="filter-chip failed-fix-chip" id="failed-fixes-toggle"
+                 style="--chip-color:#e74c3c">
+                <div class="chip-dot"></div>⚠️ Failed fixes only
+            </div>
+        </div>
+        <button id="clear-filters" onclick="clearFilters()">Clear filters</button>
+    </div>
+    ''')
+
+    out.write(f"""
         <div class="summary-cards">
             <div class="summary-card">
                 <div class="card-num">{summary.get('total_requests', 0):,}</div>
@@ -424,38 +353,63 @@ def build_sidebar_html(data):
         <div class="section">
             <div class="section-title">Chronic Hotspots</div>
             <div class="section-subtitle">Locations with repeated reports over time</div>
-            {hotspot_rows or '<div class="no-data">No chronic hotspots found</div>'}
+            <div id="hotspot-list"></div>
         </div>
         
         <div class="section">
             <div class="section-title">By Neighborhood</div>
             <div class="section-subtitle">Report volume (last {(summary.get('date_range', {}) or {}).get('start', '')[:4] or '2'} years)</div>
-            {neighborhood_rows or '<div class="no-data">No neighborhood data</div>'}
+            <div id="nbhd-list"></div>
         </div>
         
         <div class="section">
             <div class="section-title">Fix Effectiveness by Category</div>
             <div class="section-subtitle">% of all requests that appear to be re-reports after a closure</div>
-            {cat_rows}
+            <div id="cat-list"></div>
         </div>
 
         <div class="section">
             <div class="section-title">Gap Analysis</div>
             <div class="section-subtitle">Social signal without 311 activity</div>
-            {gap_rows}
+            <div id="gap-list"></div>
         </div>
         
         <div class="sidebar-footer">
             Generated {generated} · Open Baltimore + r/baltimore
         </div>
     </div>
-    """
+    """)
 
 
-def inject_ui(map_html, sidebar_html):
-    """Inject the sidebar and custom styles into the Folium map HTML."""
-    
-    custom_css = """
+# Override map div positioning to leave room for 320px sidebar
+MAP_CSS = """
+    <style>
+    body { margin: 0; padding: 0; overflow: hidden; background: #0d0f12; }
+    .folium-map {
+        position: fixed !important;
+        top: 0 !important; left: 320px !important;
+        right: 0 !important; bottom: 0 !important;
+        width: calc(100vw - 320px) !important;
+        height: 100vh !important;
+        z-index: 1;
+    }
+    </style>
+"""
+# After Folium JS initializes the map, invalidate its size so it fills the div correctly
+FIX_JS = """
+    <script>
+    window.addEventListener('load', function() {
+        setTimeout(function() {
+            // Tell the Leaflet map to recalculate its size
+            var map = getMap();
+            if (map) map.invalidateSize();
+        }, 300);
+    });
+    </script>
+"""
+
+# Sidebar, popup and filter styles, and the client-side marker/filter engine
+CUSTOM_CSS = """
     <link href="https://fonts.googleapis.com/css2?family=IBM+Plex+Mono:wght@400;600&family=IBM+Plex+Sans:wght@300;400;600&display=swap" rel="stylesheet">
     <style>
         * { box-sizing: border-box; margin: 0; padding: 0; }
@@ -1031,122 +985,501 @@ def inject_ui(map_html, sidebar_html):
         }
 
         #clear-filters:hover { color: #8899aa; }
+
+        /* Hotspot cluster bubbles */
+        .hotspot-cluster div {
+            display: flex;
+            align-items: center;
+            justify-content: center;
+            width: 100%; height: 100%;
+            border-radius: 50%;
+            background: rgba(42, 47, 54, 0.9);
+            border: 2px solid #8899aa;
+            color: #ffffff;
+            font-family: 'IBM Plex Mono', monospace;
+            font-size: 11px;
+            font-weight: 600;
+            cursor: pointer;
+        }
     </style>
-    """
-    
-    custom_js = """
+"""
+
+CUSTOM_JS = """
     <script>
+    'use strict';
+
     // ── State ──────────────────────────────────────────────────────────
     var _map = null;
-    var _markers = [];          // {marker, cat, score} for each hotspot
-    var _activeFilters = new Set(); // empty = show all
+    var _markers = [];          // {marker (null until first shown), cat, score, failed, map} per hotspot
+    var _activeFilters = new Map(); // category → its active chip; empty = show all
+    var _failedFixesOnly = false;
+    var _allIndexes = [];           // every hotspot index
+    var _byCat = new Map();         // category → its hotspot indexes
+    var _clearBtn = null;           // filter controls, looked up once on DOMContentLoaded
+    var _ffBtn = null;
 
     // ── Get the Leaflet map instance ───────────────────────────────────
+    // folium declares it as a global named MAP_NAME, after the page body
     function getMap() {
-        if (_map) return _map;
-        var candidates = Object.values(window).filter(function(v) {
-            return v && typeof v === 'object' && v._leaflet_id && typeof v.addLayer === 'function';
-        });
-        _map = candidates[0] || null;
+        if (!_map) _map = window[MAP_NAME] || null;
         return _map;
     }
 
-    // ── Severity → color ───────────────────────────────────────────────
+    // ── Severity → color and label ─────────────────────────────────────
+    // Indexed by how many of the 6/12/20/30 thresholds the score reaches
+    var SEVERITY_COLORS = ['#f1c40f', '#f39c12', '#e67e22', '#e74c3c', '#c0392b'];
+    var SEVERITY_LABELS = ['Low', 'Moderate', 'Elevated', 'High', 'Critical'];
+
+    function severityLevel(score) {
+        return (score >= 6) + (score >= 12) + (score >= 20) + (score >= 30);
+    }
+
     function severityColor(score) {
-        if (score >= 30) return '#c0392b';
-        if (score >= 20) return '#e74c3c';
-        if (score >= 12) return '#e67e22';
-        if (score >= 6)  return '#f39c12';
-        return '#f1c40f';
+        return SEVERITY_COLORS[severityLevel(score)];
+    }
+
+    function severityLabel(score) {
+        return SEVERITY_LABELS[severityLevel(score)];
+    }
+
+    // ── One hotspot record from the column-wise embedded data ──────────
+    var _hotspotData = null;
+    var FLAG_HIGH_PRIORITY = 1, FLAG_FAILED_FIXES = 2, FLAG_CATEGORY_SHIFT = 2;  // as in generate_dashboard.py
+
+    var _hotspotDataPromise = null;
+
+    function base64Bytes(b64) {
+        return Uint8Array.from(atob(b64), function(c) { return c.charCodeAt(0); });
+    }
+
+    // The embedded JSON is gzipped and base64-encoded. It's inflated with
+    // the browser's native DecompressionStream and parsed once, for both
+    // the sidebar and the markers
+    function loadHotspotData() {
+        if (_hotspotDataPromise) return _hotspotDataPromise;
+        var raw = document.getElementById('hotspot-data');
+        if (!raw) return _hotspotDataPromise = Promise.resolve(null);
+        var stream = new Blob([base64Bytes(raw.textContent.trim())]).stream()
+            .pipeThrough(new DecompressionStream('gzip'));
+        _hotspotDataPromise = new Response(stream).text().then(function(text) {
+            _hotspotData = JSON.parse(text);
+            // One packed flags byte per hotspot, base64 in the JSON
+            _hotspotData.flags = base64Bytes(_hotspotData.flags);
+            return _hotspotData;
+        });
+        return _hotspotDataPromise;
+    }
+
+    function getHotspot(i) {
+        var d = _hotspotData;
+        return {
+            lat: d.lat[i], lon: d.lon[i],
+            cat: d.cats[d.flags[i] >> FLAG_CATEGORY_SHIFT],
+            score: d.score[i],
+            addr: d.addr[i] || 'Unknown',
+            count: d.count[i],
+            high: (d.flags[i] & FLAG_HIGH_PRIORITY) !== 0,
+            failed: (d.flags[i] & FLAG_FAILED_FIXES) !== 0,
+        };
+    }
+
+    // ── Popup HTML, rendered only when a popup is opened ───────────────
+    var HTML_ESCAPES = { '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;' };
+
+    function esc(value) {
+        return String(value).replace(/[&<>"']/g, function(c) { return HTML_ESCAPES[c]; });
+    }
+
+    function failedFixes(n) {
+        return n > 1 ? 'failed fixes' : 'failed fix';
+    }
+
+    function historyStatusClass(status) {
+        var s = status.toLowerCase();
+        if (s.indexOf('closed') >= 0 && s.indexOf('duplicate') < 0) return 'hist-status-closed';
+        if (s.indexOf('open') >= 0 || s.indexOf('new') >= 0) return 'hist-status-open';
+        return '';
+    }
+
+    function renderPopup(i) {
+        var d = _hotspotData;
+        var count = d.count[i], failed = d.failed[i], id = d.id[i];
+
+        // Rows are [status, count], most common first
+        var statusRows = d.status[i].map(function(s) {
+            return '<div class="status-row"><span>' + esc(s[0]) + '</span><span>' + esc(s[1]) + '</span></div>';
+        }).join('');
+
+        // Rows are [date, status, resolution_days, is_rereport]
+        var historyRows = d.history[i].map(function(e) {
+            var status = e[1] || '—';
+            return '<tr class="' + (e[3] ? 'hist-rereport' : 'hist-normal') + '">' +
+                '<td class="hist-date">' + esc(e[0] || '—') + '</td>' +
+                '<td class="hist-status ' + historyStatusClass(status) + '">' + esc(status) + ' ' +
+                    (e[3] ? '<span class="rereport-badge">↩ re-report</span>' : '') + '</td>' +
+                '<td class="hist-res">' + (e[2] != null ? esc(e[2]) + 'd' : '—') + '</td></tr>';
+        }).join('');
+
+        return '<div class="popup-card">' +
+            '<div class="popup-header">' +
+                '<div class="popup-title">' + esc(d.addr[i] || 'Location') + '</div>' +
+                '<div class="popup-neighborhood">' + esc(d.hood[i]) + ' ' +
+                    ((d.flags[i] & FLAG_HIGH_PRIORITY) ? '<span class="priority-badge">HIGH PRIORITY</span>' : '') +
+                '</div>' +
+            '</div>' +
+            '<div class="popup-type">' + esc(d.type[i]) + '</div>' +
+            (failed > 0 ?
+                '<div class="failed-fix-warning">⚠️ ' + failed + ' possible ' + failedFixes(failed) +
+                ' <span class="failed-fix-note">Re-reported within 120 days of closure</span></div>' : '') +
+            '<div class="popup-stats">' +
+                '<div class="stat-box"><div class="stat-num">' + count + '</div><div class="stat-label">total reports</div></div>' +
+                '<div class="stat-box"><div class="stat-num">' + d.span[i] + '</div><div class="stat-label">days active</div></div>' +
+                '<div class="stat-box"><div class="stat-num">' + d.score[i].toFixed(1) + '</div><div class="stat-label">severity score</div></div>' +
+            '</div>' +
+            '<div class="popup-timeline-range">' +
+                '<span>First: ' + esc(d.first[i]) + '</span><span>→</span><span>Last: ' + esc(d.last[i]) + '</span>' +
+            '</div>' +
+            (d.res[i] != null ? '<div class="popup-resolution">Median resolution: ' + d.res[i] + ' days</div>' : '') +
+            '<div class="status-breakdown"><div class="status-heading">Status breakdown</div>' + statusRows + '</div>' +
+            '<div class="history-section">' +
+                '<button class="history-toggle" data-count="' + count + '" onclick="toggleHistory(\\'hist-' + id + '\\', this)">' +
+                    '▶ Show full history (' + count + ' reports)</button>' +
+                '<div id="hist-' + id + '" class="history-table-wrap" style="display:none">' +
+                    '<table class="history-table"><thead><tr><th>Date</th><th>Status</th><th>Resolved</th></tr></thead>' +
+                    '<tbody>' + historyRows + '</tbody></table>' +
+                '</div>' +
+            '</div>' +
+        '</div>';
+    }
+
+    // Popup content callback: Leaflet passes the marker being opened
+    function popupContent(marker) {
+        return renderPopup(marker.options.hotspotIndex);
+    }
+
+    // ── Sidebar lists, rendered from the embedded JSON ─────────────────
+    function truncate(s, n) {
+        return s.length > n ? s.slice(0, n) + '...' : s;
+    }
+
+    function hotspotRow(d, i) {
+        var cat = d.cats[d.flags[i] >> FLAG_CATEGORY_SHIFT];
+        var color = severityColor(d.score[i]);
+        var failed = d.failed[i];
+        return '<div class="hotspot-row" data-cat="' + esc(cat) + '" data-failed="' + failed + '"' +
+                ' onclick="focusHotspot(' + d.lat[i] + ', ' + d.lon[i] + ')">' +
+            '<div class="hotspot-dot" style="background:' + (CATEGORY_COLORS[cat] || color) + '"></div>' +
+            '<div class="hotspot-info">' +
+                '<div class="hotspot-addr">' + esc(truncate(d.addr[i] || 'Unknown location', 35)) + '</div>' +
+                '<div class="hotspot-meta">' + esc(d.hood[i]) + ' · ' + d.count[i] + ' reports · ' +
+                    '<span class="severity-tag" style="color:' + color + '">' + severityLabel(d.score[i]) + '</span> ' +
+                    (failed ? '<span class="failed-tag">⚠️ ' + failed + ' ' + failedFixes(failed) + '</span>' : '') +
+                '</div>' +
+            '</div>' +
+        '</div>';
+    }
+
+    var _rows = [];  // {el, cat, failed, visible} per sidebar hotspot row
+
+    function renderSidebar(d) {
+        var side = JSON.parse(document.getElementById('sidebar-data').textContent);
+        var n = d ? d.lat.length : 0;
+
+        // Filter chips for the categories present, most hotspots first
+        var catCounts = d ? d.cats.map(function() { return 0; }) : [];
+        for (var i = 0; i < n; i++) catCounts[d.flags[i] >> FLAG_CATEGORY_SHIFT]++;
+        var chipCats = catCounts.map(function(c, id) { return id; })
+            .filter(function(id) { return catCounts[id] > 0; })
+            .sort(function(a, b) { return catCounts[b] - catCounts[a]; });
+        document.getElementById('filter-chips').insertAdjacentHTML('afterbegin', chipCats.map(function(id) {
+            var cat = d.cats[id];
+            return '<div class="filter-chip" data-cat="' + esc(cat) + '" style="--chip-color:' +
+                (CATEGORY_COLORS[cat] || '#7f8c8d') + '">' +
+                '<div class="chip-dot"></div>' + esc(cat) +
+                ' <span style="opacity:.5;font-size:10px">(' + catCounts[id] + ')</span></div>';
+        }).join(''));
+
+        // Top hotspots by severity: one pass keeping the best 8 in order
+        var top = [];
+        for (var i = 0; i < n; i++) {
+            if (top.length === 8 && d.score[i] <= d.score[top[7]]) continue;
+            var j = Math.min(top.length, 7);
+            while (j > 0 && d.score[top[j - 1]] < d.score[i]) { top[j] = top[j - 1]; j--; }
+            top[j] = i;
+        }
+        var list = document.getElementById('hotspot-list');
+        list.innerHTML = top.length ?
+            top.map(function(i) { return hotspotRow(d, i); }).join('') :
+            '<div class="no-data">No chronic hotspots found</div>';
+        // Kept for the filters, which then never query the DOM for rows
+        _rows = top.map(function(i, k) {
+            return { el: list.children[k], cat: d.cats[d.flags[i] >> FLAG_CATEGORY_SHIFT], failed: d.failed[i], visible: true };
+        });
+
+        // Neighborhood rows are [name, total_reports, trend_pct]
+        var maxReports = side.neighborhoods.length ? side.neighborhoods[0][1] : 1;
+        document.getElementById('nbhd-list').innerHTML = side.neighborhoods.length ? side.neighborhoods.map(function(r) {
+            var trend = r[2], trendHtml = '';
+            if (trend != null) {
+                var arrow = trend > 5 ? '↑' : trend < -5 ? '↓' : '→';
+                var color = trend > 10 ? '#e74c3c' : trend < -10 ? '#2ecc71' : '#95a5a6';
+                trendHtml = '<span style="color:' + color + ';font-size:11px">' + arrow + ' ' + Math.abs(Math.round(trend)) + '%</span>';
+            }
+            return '<div class="nbhd-row">' +
+                '<div class="nbhd-name">' + esc(truncate(r[0], 22)) + ' ' + trendHtml + '</div>' +
+                '<div class="nbhd-bar-wrap"><div class="nbhd-bar" style="width:' + (r[1] / maxReports * 100) + '%"></div></div>' +
+                '<div class="nbhd-count">' + r[1] + '</div>' +
+            '</div>';
+        }).join('') : '<div class="no-data">No neighborhood data</div>';
+
+        // Category rows are [category, recurrence_pct, total_requests, rereports]
+        document.getElementById('cat-list').innerHTML = side.categories.length ? side.categories.map(function(r) {
+            var pct = r[1];
+            // Color the bar red if high recurrence, amber if medium, green if low
+            var barColor = pct >= 40 ? '#e74c3c' : pct >= 20 ? '#e67e22' : '#2ecc71';
+            return '<div class="cat-row">' +
+                '<div class="cat-header">' +
+                    '<div class="cat-dot" style="background:' + (CATEGORY_COLORS[r[0]] || '#7f8c8d') + '"></div>' +
+                    '<div class="cat-name">' + esc(r[0]) + '</div>' +
+                    '<div class="cat-pct" style="color:' + barColor + '">' + pct + '%</div>' +
+                '</div>' +
+                '<div class="cat-bar-wrap"><div class="cat-bar" style="width:' + Math.min(pct, 100) + '%;background:' + barColor + '"></div></div>' +
+                '<div class="cat-detail">' + r[2].toLocaleString('en-US') + ' requests · ' +
+                    r[3].toLocaleString('en-US') + ' apparent re-reports</div>' +
+            '</div>';
+        }).join('') : '<div class="no-data">Re-run analyze.py to generate category stats</div>';
+
+        // Gap rows are [neighborhood, reddit_signal, 311_reports]
+        document.getElementById('gap-list').innerHTML = side.gaps.length ? side.gaps.map(function(r) {
+            return '<div class="gap-row">' +
+                '<div class="gap-name">' + esc(r[0]) + '</div>' +
+                '<div class="gap-meta">Reddit signal: ' + r[1] + ' · 311 reports: ' + r[2] + '</div>' +
+            '</div>';
+        }).join('') : '<div class="no-data">Run fetch_reddit.py to enable gap analysis</div>';
     }
 
     // ── Build all markers from embedded JSON ───────────────────────────
     function buildMarkers() {
         var map = getMap();
         if (!map) { setTimeout(buildMarkers, 400); return; }
+        loadHotspotData().then(function(d) {
+            if (d) addHotspotLayers(map);
+        });
+    }
 
-        var raw = document.getElementById('hotspot-data');
-        if (!raw) return;
-        var hotspots = JSON.parse(raw.textContent);
-        var catColors = JSON.parse(document.getElementById('category-colors').textContent);
-
-        hotspots.forEach(function(h) {
-            var color = catColors[h.cat] || severityColor(h.score);
-            var radius = h.high ? 10 : 7;
-
-            var marker = L.circleMarker([h.lat, h.lon], {
-                radius: radius,
-                color: color,
-                weight: h.high ? 2 : 1,
-                fill: true,
-                fillColor: color,
-                fillOpacity: 0.85,
-            });
+    function addHotspotLayers(map) {
+        var n = _hotspotData.lat.length;
+        var heat = JSON.parse(document.getElementById('heat-config').textContent);
+
+        // Thin base heatmap using just the top hotspots (perf), under the markers
+        var heatPoints = [];
+        for (var i = 0; i < Math.min(n, heat.points); i++) {
+            heatPoints.push([_hotspotData.lat[i], _hotspotData.lon[i],
+                             Math.min(_hotspotData.score[i], heat.max_weight)]);
+        }
+        window.heatLayer = L.heatLayer(heatPoints, heat.options).addTo(map);
+
+        // Every marker draws into this one canvas: no DOM node per marker,
+        // and a pan or filter change is a single redraw of all points.
+        // The padding keeps markers just off-screen drawn while panning
+        _renderer = L.canvas({ padding: 0.5 });
+        _clusterLayer = L.layerGroup().addTo(map);
+        _shown = new Uint8Array(n);
+
+        // Markers themselves are only created once they're first on screen.
+        // Their indexes are binned by category for the filters
+        for (var i = 0; i < n; i++) {
+            var h = getHotspot(i);
+            _markers.push({ marker: null, cat: h.cat, score: h.score, failed: h.failed, map: map });
+            _allIndexes.push(i);
+            if (!_byCat.has(h.cat)) _byCat.set(h.cat, []);
+            _byCat.get(h.cat).push(i);
+        }
+        map.on('moveend', renderClusters);
+
+        console.log('Indexed ' + _markers.length + ' hotspots');
+        updateVisibility();
+    }
+
+    // ── The marker for hotspot i, created on first use ─────────────────
+    var _renderer = null;
+
+    function markerFor(i) {
+        var m = _markers[i];
+        if (m.marker) return m.marker;
+
+        var h = getHotspot(i);
+        var color = CATEGORY_COLORS[h.cat] || severityColor(h.score);
+        var radius = h.high ? 10 : 7;
+
+        var marker = L.circleMarker([h.lat, h.lon], {
+            radius: radius,
+            color: color,
+            weight: h.high ? 2 : 1,
+            fill: true,
+            fillColor: color,
+            fillOpacity: 0.85,
+            renderer: _renderer,
+            hotspotIndex: i,
+        });
 
-            // Popup
-            var popup = L.popup({ maxWidth: 320 });
-            popup.setContent(h.popup);
-            marker.bindPopup(popup);
-            marker.bindTooltip(h.addr + ' — ' + h.count + ' reports', { sticky: true });
+        // Popup, rendered on open
+        var popup = L.popup({ maxWidth: 320 });
+        popup.setContent(popupContent);
+        marker.bindPopup(popup);
+        marker.bindTooltip(h.addr + ' — ' + h.count + ' reports', { sticky: true });
 
-            marker.addTo(map);
-            _markers.push({ marker: marker, cat: h.cat, score: h.score, failed: h.failed || 0, map: map });
+        m.marker = marker;
+        return marker;
+    }
+
+    // ── Clustering: only what's in view at this zoom is on the map ─────
+    var CLUSTER_OPTIONS = { radius: 40, maxZoom: 16 };
+    var _index = null;              // Supercluster over the filtered hotspots
+    var _clusterLayer = null;
+    var _clusterMarkers = [];       // cluster bubbles currently shown
+    var _shownPoints = [];          // indexes of hotspot markers currently shown
+    var _shown = null;              // Uint8Array per hotspot: SHOWN if on the map now
+    var SHOWN = 1, SHOW_NEXT = 2;
+
+    function loadClusterIndex(indexes) {
+        var points = indexes.map(function(i) {
+            return {
+                type: 'Feature',
+                geometry: { type: 'Point', coordinates: [_hotspotData.lon[i], _hotspotData.lat[i]] },
+                properties: { i: i },
+            };
         });
+        _index = new Supercluster(CLUSTER_OPTIONS).load(points);
+        renderClusters();
+    }
 
-        console.log('Built ' + _markers.length + ' markers');
-        updateVisibility();
+    function renderClusters() {
+        var map = getMap();
+        if (!map || !_index) return;
+        var b = map.getBounds();
+        var features = _index.getClusters(
+            [b.getWest(), b.getSouth(), b.getEast(), b.getNorth()], Math.round(map.getZoom()));
+
+        // Cluster bubbles differ per zoom so they're rebuilt, but hotspot
+        // markers that stay in view are kept (an open popup survives a pan)
+        _clusterMarkers.forEach(function(c) { _clusterLayer.removeLayer(c); });
+        _clusterMarkers = [];
+        var next = [];
+        features.forEach(function(f) {
+            if (f.properties.cluster) {
+                var c = clusterMarker(f);
+                _clusterLayer.addLayer(c);
+                _clusterMarkers.push(c);
+            } else {
+                next.push(f.properties.i);
+                _shown[f.properties.i] |= SHOW_NEXT;
+            }
+        });
+        // Diff the two states in the bitmap, then make next the shown set
+        _shownPoints.forEach(function(i) {
+            if (!(_shown[i] & SHOW_NEXT)) {
+                _clusterLayer.removeLayer(_markers[i].marker);
+                _shown[i] = 0;
+            }
+        });
+        next.forEach(function(i) {
+            if (!(_shown[i] & SHOWN)) _clusterLayer.addLayer(markerFor(i));
+            _shown[i] = SHOWN;
+        });
+        _shownPoints = next;
+    }
+
+    function clusterMarker(f) {
+        var count = f.properties.point_count;
+        var size = count < 10 ? 26 : count < 100 ? 32 : 40;
+        var latlng = [f.geometry.coordinates[1], f.geometry.coordinates[0]];
+        var marker = L.marker(latlng, {
+            icon: L.divIcon({
+                html: '<div>' + f.properties.point_count_abbreviated + '</div>',
+                className: 'hotspot-cluster',
+                iconSize: [size, size],
+            }),
+        });
+        marker.bindTooltip(count + ' hotspots');
+        marker.on('click', function() {
+            getMap().setView(latlng, _index.getClusterExpansionZoom(f.properties.cluster_id));
+        });
+        return marker;
     }
 
     // ── Show/hide markers based on active filters ──────────────────────
+    // Filter changes within one frame are coalesced into a single update
+    var _visibilityPending = false;
+
     function updateVisibility() {
-        _markers.forEach(function(m) {
-            var show = _activeFilters.size === 0 || _activeFilters.has(m.cat);
-            if (show) {
-                if (!m.map.hasLayer(m.marker)) m.marker.addTo(m.map);
-            } else {
-                if (m.map.hasLayer(m.marker)) m.map.removeLayer(m.marker);
-            }
+        if (_visibilityPending) return;
+        _visibilityPending = true;
+        requestAnimationFrame(function() {
+            _visibilityPending = false;
+            applyVisibility();
         });
+    }
 
-        // Update sidebar hotspot list visibility
-        document.querySelectorAll('.hotspot-row').forEach(function(row) {
-            var cat = row.getAttribute('data-cat');
-            var show = _activeFilters.size === 0 || _activeFilters.has(cat);
-            row.style.display = show ? '' : 'none';
+    function applyVisibility() {
+        // The cluster index is rebuilt over the hotspots that pass the
+        // filters. Only the bins of the active categories are visited
+        var visible = _allIndexes;
+        if (_activeFilters.size > 0) {
+            visible = [];
+            _activeFilters.forEach(function(chip, cat) {
+                var bin = _byCat.get(cat);
+                if (bin) visible = visible.concat(bin);
+            });
+        }
+        if (_failedFixesOnly) {
+            visible = visible.filter(function(i) { return _markers[i].failed; });
+        }
+        loadClusterIndex(visible);
+        // Only rows whose visibility changed are touched
+        _rows.forEach(function(row) {
+            var catMatch = _activeFilters.size === 0 || _activeFilters.has(row.cat);
+            var failedMatch = !_failedFixesOnly || row.failed > 0;
+            var show = catMatch && failedMatch;
+            if (show !== row.visible) {
+                row.el.style.display = show ? '' : 'none';
+                row.visible = show;
+            }
         });
     }
 
     // ── Toggle a filter chip ───────────────────────────────────────────
-    function toggleFilter(cat) {
+    // One delegated listener handles every chip, including ones rendered later
+    function onChipClick(e) {
+        var chip = e.target.closest('.filter-chip');
+        if (!chip) return;
+        if (chip.id === 'failed-fixes-toggle') toggleFailedFixes();
+        else toggleFilter(chip);
+    }
+
+    function toggleFilter(chip) {
+        var cat = chip.dataset.cat;
         if (_activeFilters.has(cat)) {
             _activeFilters.delete(cat);
+            chip.classList.remove('active');
         } else {
-            _activeFilters.add(cat);
+            _activeFilters.set(cat, chip);
+            chip.classList.add('active');
         }
 
-        // Update chip appearance
-        document.querySelectorAll('.filter-chip').forEach(function(chip) {
-            if (chip.getAttribute('data-cat') === cat) {
-                chip.classList.toggle('active', _activeFilters.has(cat));
-            }
-        });
-
         // Update "clear" button visibility
-        document.getElementById('clear-filters').style.display =
-            _activeFilters.size > 0 ? 'block' : 'none';
+        _clearBtn.style.display = _activeFilters.size > 0 ? 'block' : 'none';
 
         updateVisibility();
     }
 
     function clearFilters() {
+        _activeFilters.forEach(function(chip) { chip.classList.remove('active'); });
         _activeFilters.clear();
         _failedFixesOnly = false;
-        document.querySelectorAll('.filter-chip').forEach(function(c) {
-            c.classList.remove('active');
-        });
-        var ffBtn = document.getElementById('failed-fixes-toggle');
-        if (ffBtn) ffBtn.textContent = '⚠️ Failed fixes only';
-        document.getElementById('clear-filters').style.display = 'none';
+        _ffBtn.classList.remove('active');
+        _ffBtn.textContent = '⚠️ Failed fixes only';
+        _clearBtn.style.display = 'none';
         updateVisibility();
     }
 
@@ -1164,49 +1497,25 @@ def inject_ui(map_html, sidebar_html):
         el.style.display = open ? 'block' : 'none';
         btn.classList.toggle('open', open);
         btn.textContent = (open ? '▼ Hide history' : '▶ Show full history') +
-            btn.textContent.replace(/[▼▶] (Hide|Show full) history/, '').trim();
-        // Re-extract report count from original text
-        var m = btn.textContent.match(/[(](\\d+) reports[)]/);
-        var cnt = m ? ' (' + m[1] + ' reports)' : '';
-        btn.textContent = (open ? '▼ Hide history' : '▶ Show full history') + cnt;
+            ' (' + btn.dataset.count + ' reports)';
     }
 
     // ── Failed-fixes-only toggle ───────────────────────────────────────
-    var _failedFixesOnly = false;
-
     function toggleFailedFixes() {
         _failedFixesOnly = !_failedFixesOnly;
-        var btn = document.getElementById('failed-fixes-toggle');
-        if (btn) {
-            btn.classList.toggle('active', _failedFixesOnly);
-            btn.textContent = _failedFixesOnly ? '⚠️ Failed fixes (on)' : '⚠️ Failed fixes only';
-        }
+        _ffBtn.classList.toggle('active', _failedFixesOnly);
+        _ffBtn.textContent = _failedFixesOnly ? '⚠️ Failed fixes (on)' : '⚠️ Failed fixes only';
         updateVisibility();
     }
 
-    // Patch updateVisibility to respect failed-fixes filter
-    var _origUpdateVisibility = null;
-    function updateVisibility() {
-        _markers.forEach(function(m) {
-            var catMatch = _activeFilters.size === 0 || _activeFilters.has(m.cat);
-            var failedMatch = !_failedFixesOnly || m.failed > 0;
-            var show = catMatch && failedMatch;
-            if (show) {
-                if (!m.map.hasLayer(m.marker)) m.marker.addTo(m.map);
-            } else {
-                if (m.map.hasLayer(m.marker)) m.map.removeLayer(m.marker);
-            }
-        });
-        document.querySelectorAll('.hotspot-row').forEach(function(row) {
-            var cat = row.getAttribute('data-cat');
-            var failed = parseInt(row.getAttribute('data-failed') || '0');
-            var catMatch = _activeFilters.size === 0 || _activeFilters.has(cat);
-            var failedMatch = !_failedFixesOnly || failed > 0;
-            row.style.display = (catMatch && failedMatch) ? '' : 'none';
-        });
-    }
-
     // ── Init ───────────────────────────────────────────────────────────
+    document.addEventListener('DOMContentLoaded', function() {
+        _clearBtn = document.getElementById('clear-filters');
+        _ffBtn = document.getElementById('failed-fixes-toggle');
+        document.getElementById('filter-chips').addEventListener('click', onChipClick);
+        loadHotspotData().then(renderSidebar);
+    });
+
     window.addEventListener('load', function() {
         setTimeout(function() {
             var map = getMap();
@@ -1215,13 +1524,69 @@ def inject_ui(map_html, sidebar_html):
         }, 350);
     });
     </script>
+"""
+
+
+_STYLE_RE = re.compile(r'(<style>)(.*?)(</style>)', re.S)
+_SCRIPT_RE = re.compile(r'(<script>)(.*?)(</script>)', re.S)
+_CSS_COMMENT_RE = re.compile(r'/\*.*?\*/', re.S)
+_CSS_SPACE_RE = re.compile(r'\s*([{}:;,>])\s*')
+
+
+def minify_css(html):
+    """html with the CSS in its <style> blocks stripped of comments and spare whitespace."""
+    def minify(m):
+        css = _CSS_COMMENT_RE.sub('', m[2])
+        css = _CSS_SPACE_RE.sub(r'\1', ' '.join(css.split()))
+        return m[1] + css.replace(';}', '}') + m[3]
+    return _STYLE_RE.sub(minify, html)
+
+
+def minify_js(html):
+    """html with the JS in its <script> blocks minified, when rjsmin is installed."""
+    if rjsmin is None:
+        return html
+    return _SCRIPT_RE.sub(lambda m: m[1] + rjsmin.jsmin(m[2]) + m[3], html)
+
+
+# The styles and scripts as shipped, minified once at import
+PAGE_CSS = minify_css(MAP_CSS + CUSTOM_CSS)
+PAGE_FIX_JS = minify_js(FIX_JS)
+PAGE_JS = minify_js(CUSTOM_JS)
+
+
+class TeeWriter:
+    """A write-only text stream that copies everything to several streams."""
+
+    def __init__(self, *streams):
+        self.streams = streams
+
+    def write(self, s):
+        for stream in self.streams:
+            stream.write(s)
+
+
+def write_dashboard(map_html, map_name, data, df, out):
     """
-    
-    # Inject into the map HTML
-    map_html = map_html.replace('</head>', custom_css + '</head>')
-    map_html = map_html.replace('</body>', sidebar_html + custom_js + '</body>')
-    
-    return map_html
+    Write the Folium map HTML to out with the map data, sidebar and custom
+    styles spliced in, streaming the pieces rather than building one page
+    string. map_name is the global folium declares the map as; df is the
+    hotspot_frame.
+    """
+    # Inject into the map HTML. The two tags are located once, the body's
+    # search starting past the head, and each piece is sliced out once
+    head_end = map_html.index('</head>')
+    body_end = map_html.index('</body>', head_end)
+    out.write(map_html[:head_end])
+    out.write(PAGE_CSS)
+    out.write(map_html[head_end:body_end])
+    # The client scripts look the map up by name rather than searching window
+    out.write(f"\n    <script>var MAP_NAME = '{map_name}';</script>\n")
+    write_map_data(df, out)
+    out.write(PAGE_FIX_JS)
+    write_sidebar_html(data, out)
+    out.write(PAGE_JS)
+    out.write(map_html[body_end:])
 
 
 def main():
@@ -1233,66 +1598,43 @@ def main():
         return
     
     print("Loading analysis results...")
-    with open(DATA_PATH) as f:
-        data = json.load(f)
+    data = load_results(DATA_PATH)
     
     summary = data.get('summary', {})
     print(f"  {summary.get('chronic_hotspots', 0)} chronic hotspots")
     print(f"  {summary.get('neighborhoods_analyzed', 0)} neighborhoods")
     
-    print("Building map...")
-    m = build_map(data)
+    df = hotspot_frame(data.get('hotspots', []))
     
-    print("Building sidebar...")
-    sidebar_html = build_sidebar_html(data)
+    print("Building map...")
+    m = build_map()
     
     print("Assembling dashboard...")
 
-    # Use folium.save() to get a proper standalone HTML file
-    import tempfile as _tempfile
-    import os as _os
-    _tmp = _tempfile.mktemp(suffix=".html")
-    m.save(_tmp)
-    with open(_tmp, "r", encoding="utf-8") as f:
-        full_html = f.read()
-    _os.unlink(_tmp)
-
-    # Override map div positioning to leave room for 320px sidebar
-    _map_css = """
-    <style>
-    body { margin: 0; padding: 0; overflow: hidden; background: #0d0f12; }
-    .folium-map {
-        position: fixed !important;
-        top: 0 !important; left: 320px !important;
-        right: 0 !important; bottom: 0 !important;
-        width: calc(100vw - 320px) !important;
-        height: 100vh !important;
-        z-index: 1;
-    }
-    </style>
-    """
-    # After Folium JS initializes the map, invalidate its size so it fills the div correctly
-    _fix_js = """
-    <script>
-    window.addEventListener('load', function() {
-        setTimeout(function() {
-            // Find the Leaflet map instance and tell it to recalculate its size
-            var maps = Object.values(window).filter(function(v) {
-                return v && typeof v === 'object' && v._leaflet_id && typeof v.invalidateSize === 'function';
-            });
-            maps.forEach(function(m) { m.invalidateSize(); });
-        }, 300);
-    });
-    </script>
-    """
-    full_html = full_html.replace("</head>", _map_css + "</head>")
-    full_html = full_html.replace("</body>", _fix_js + "</body>")
-    full_html = inject_ui(full_html, sidebar_html)
-
-    with open(OUTPUT_PATH, "w", encoding="utf-8") as f:
-        f.write(full_html)
+    # The standalone map page, as folium's save() would write it
+    map_html = m.get_root().render()
+
+    # Both files are written under temporary names and moved into place,
+    # so a killed run never leaves a truncated dashboard behind
+    html_tmp, gz_tmp = OUTPUT_PATH + '.tmp', OUTPUT_GZ_PATH + '.tmp'
+    try:
+        # The page is streamed into both files in one pass. The gzip member
+        # is named after the real file, not the temporary one
+        with open(html_tmp, "w", encoding="utf-8", buffering=1 << 20) as f, \
+                open(gz_tmp, 'wb') as raw, \
+                gzip.GzipFile(os.path.basename(OUTPUT_PATH), 'wb', 6, raw) as gz, \
+                io.TextIOWrapper(gz, encoding='utf-8') as gz_text:
+            write_dashboard(map_html, m.get_name(), data, df, TeeWriter(f, gz_text))
+
+        os.replace(html_tmp, OUTPUT_PATH)
+        os.replace(gz_tmp, OUTPUT_GZ_PATH)
+    finally:
+        for tmp in (html_tmp, gz_tmp):
+            if os.path.exists(tmp):
+                os.remove(tmp)
 
     print(f"\nDashboard saved to: {OUTPUT_PATH}")
+    print(f"  (gzipped copy: {OUTPUT_GZ_PATH})")
     print("Open in any browser — no server needed.")
 
 if __name__ == "__main__":